@@ -2,7 +2,20 @@ from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, Asyn
 from sqlalchemy.orm import DeclarativeBase
 from .core.config import settings
 
-engine = create_async_engine(settings.database_url, future=True, echo=False)
+# Sized for the API's burst traffic; pre-ping/recycle keep long-idle
+# connections from surfacing as mid-request disconnects, and the asyncpg
+# prepared-statement cache amortizes server-side parse/plan across the
+# repeated text() statements the routers issue.
+engine = create_async_engine(
+    settings.database_url,
+    future=True,
+    echo=False,
+    pool_size=20,
+    max_overflow=10,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    connect_args={"prepared_statement_cache_size": 1024},
+)
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 class Base(DeclarativeBase):
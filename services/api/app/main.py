@@ -1,9 +1,32 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from .core.config import settings
 from .routers import auth, projects, files, locks, jobs, inventory
+from .s3 import ensure_bucket
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create/verify the bucket once per process; request handlers that
+    # still call ensure_bucket hit its memo and never touch S3.
+    # Best-effort: if MinIO isn't up yet the API must still boot (compose
+    # has no healthcheck ordering) — the memo stays unset on failure, so
+    # the per-request ensure_bucket calls retry until S3 is reachable.
+    try:
+        await asyncio.to_thread(ensure_bucket)
+    except Exception as e:
+        logging.getLogger(__name__).warning("ensure_bucket at startup failed: %s", e)
+    yield
+
 
-app = FastAPI(title="Workshop API", version="0.1.0")
+# orjson serializes model dicts in one C pass instead of the default
+# jsonable_encoder dict walk.
+app = FastAPI(title="Workshop API", version="0.1.0", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -27,6 +27,23 @@ async def write(
     )
     await db.commit()
 
+async def write_async(
+    user_id: UUID | None,
+    action: str,
+    entity_type: str,
+    entity_id: UUID | None,
+    meta: Dict[str, Any] | None = None,
+):
+    # BackgroundTasks variant: runs after the response, so it opens its own
+    # session (the request's session is already closed by then).
+    from ..db import SessionLocal
+    try:
+        async with SessionLocal() as db:
+            await write(db, user_id, action, entity_type, entity_id, meta)
+    except Exception:
+        # audit must never break (or delay) the request path
+        pass
+
 def json_dumps(obj):
     import json
     return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
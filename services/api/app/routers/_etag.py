@@ -0,0 +1,17 @@
+import hashlib
+
+from fastapi import Request
+
+
+def compute(*parts) -> str:
+    """Strong ETag from whatever identifies the current state (timestamps,
+    status fields, or raw payload bytes)."""
+    h = hashlib.blake2b(digest_size=8)
+    for p in parts:
+        h.update(p if isinstance(p, bytes) else str(p).encode())
+        h.update(b"|")
+    return f'"{h.hexdigest()}"'
+
+
+def matches(request: Request, etag: str) -> bool:
+    return request.headers.get("if-none-match") == etag
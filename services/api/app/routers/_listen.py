@@ -0,0 +1,66 @@
+"""Shared LISTEN connection fanning out Postgres NOTIFYs to subscribers.
+
+One pooled connection per process carries every LISTEN instead of each
+SSE stream pinning its own; payloads are dispatched to per-channel
+asyncio queues. The connection never runs queries, so it stays outside
+any transaction and NOTIFY delivery is immediate.
+"""
+import asyncio
+
+from ..db import engine
+
+_lock = asyncio.Lock()
+_conn = None
+_driver = None  # asyncpg connection
+_subs: dict[str, set[asyncio.Queue]] = {}
+
+
+def _dispatch(_conn, _pid, channel, payload):
+    for q in _subs.get(channel, ()):
+        q.put_nowait(payload)
+
+
+async def _ensure_driver():
+    # (Re)open the shared connection and re-attach surviving LISTENs.
+    global _conn, _driver
+    if _driver is not None and not _driver.is_closed():
+        return _driver
+    if _conn is not None:
+        try:
+            await _conn.close()
+        except Exception:
+            pass
+        _conn = _driver = None
+    conn = await engine.connect()
+    raw = await conn.get_raw_connection()
+    _conn = conn
+    _driver = raw.driver_connection
+    for ch in _subs:
+        await _driver.add_listener(ch, _dispatch)
+    return _driver
+
+
+async def subscribe(channel: str) -> asyncio.Queue:
+    q: asyncio.Queue = asyncio.Queue()
+    async with _lock:
+        driver = await _ensure_driver()
+        subs = _subs.setdefault(channel, set())
+        if not subs:
+            await driver.add_listener(channel, _dispatch)
+        subs.add(q)
+    return q
+
+
+async def unsubscribe(channel: str, q: asyncio.Queue) -> None:
+    async with _lock:
+        subs = _subs.get(channel)
+        if not subs:
+            return
+        subs.discard(q)
+        if not subs:
+            _subs.pop(channel, None)
+            if _driver is not None and not _driver.is_closed():
+                try:
+                    await _driver.remove_listener(channel, _dispatch)
+                except Exception:
+                    pass
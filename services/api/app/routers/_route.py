@@ -0,0 +1,29 @@
+"""Route class that parses request bodies with orjson.
+
+FastAPI hands ``await request.json()`` to pydantic for every JSON body;
+swapping the stdlib parse for orjson (which also skips the separate
+UTF-8 decode) speeds up the inbound half of each POST/PATCH. Set as
+``route_class`` on the routers; everything else about the request flow
+is unchanged.
+"""
+
+import orjson
+from fastapi import Request
+from fastapi.routing import APIRoute
+
+
+class ORJSONRequest(Request):
+    async def json(self):
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def custom_handler(request: Request):
+            return await handler(ORJSONRequest(request.scope, request.receive))
+
+        return custom_handler
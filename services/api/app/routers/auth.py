@@ -2,13 +2,14 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from . import _audit
+from ._route import ORJSONRoute
 from ..db import get_db
 from ..models import User
 from ..schemas import LoginRequest, TokenResponse, MeResponse
 from ..core.security import verify_password, create_access_token
 from ..deps import get_current_user
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(prefix="/auth", tags=["auth"], route_class=ORJSONRoute)
 
 @router.post("/login", response_model=TokenResponse)
 async def login(req: LoginRequest, db: AsyncSession = Depends(get_db)):
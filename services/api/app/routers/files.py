@@ -1,8 +1,9 @@
 
+import asyncio
 import re
 import uuid
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
@@ -16,11 +17,14 @@ from ..schemas import (
     FileCreate, FileRenameRequest, FileOut, InitiateUploadRequest, InitiateUploadResponse,
     CompleteUploadRequest, FileMetadataOut, PresignDownloadResponse, FileVersionOut,
 )
+from ..schemas_fast import json_encoder, FileOutMS
 from ..deps import get_current_user
-from ..s3 import ensure_bucket, presign_put, presign_get
+from ..s3 import ensure_bucket, presign_put, presign_get, presign_get_many
 from . import _audit
+from ._route import ORJSONRoute
+
+router = APIRouter(prefix="/files", tags=["files"], route_class=ORJSONRoute)
 
-router = APIRouter(prefix="/files", tags=["files"])
 @router.get("", response_model=list[FileOut])
 async def list_files(
     project_id: UUID | None = None,
@@ -42,7 +46,10 @@ async def list_files(
         """), {"pid": str(project_id)})
 
     rows = result.mappings().all()
-    return [FileOut(**r) for r in rows]
+    return Response(
+        content=json_encoder.encode([FileOutMS(**r) for r in rows]),
+        media_type="application/json",
+    )
 @router.get("/{file_id}", response_model=FileOut)
 async def get_file(file_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     result = await db.execute(text("""
@@ -53,7 +60,7 @@ async def get_file(file_id: UUID, db: AsyncSession = Depends(get_db), user: User
     row = result.mappings().one_or_none()
     if not row:
         raise HTTPException(404, "File not found")
-    return FileOut(**row)
+    return FileOut.model_construct(**row)
 
 
 async def _ensure_not_locked(file_id: UUID, db: AsyncSession, user: User):
@@ -79,7 +86,7 @@ async def _ensure_not_locked(file_id: UUID, db: AsyncSession, user: User):
 
 
 @router.patch("/{file_id}", response_model=FileOut)
-async def rename_file(file_id: UUID, req: FileRenameRequest, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def rename_file(file_id: UUID, req: FileRenameRequest, bg: BackgroundTasks, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     # block rename if locked by someone else
     await _ensure_not_locked(file_id, db, user)
 
@@ -134,12 +141,12 @@ async def rename_file(file_id: UUID, req: FileRenameRequest, db: AsyncSession =
     """), {"fid": str(file_id), "name": new_name})
     row = result.mappings().one()
     await db.commit()
-    await _audit.write(db, user.id, "file.rename", "file", file_id, meta={"old_name": cur.get("name"), "new_name": new_name})
-    return FileOut(**row)
+    bg.add_task(_audit.write_async, user.id, "file.rename", "file", file_id, meta={"old_name": cur.get("name"), "new_name": new_name})
+    return FileOut.model_construct(**row)
 
 
 @router.delete("/{file_id}")
-async def delete_file(file_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def delete_file(file_id: UUID, bg: BackgroundTasks, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     # block delete if locked by someone else
     await _ensure_not_locked(file_id, db, user)
 
@@ -153,30 +160,36 @@ async def delete_file(file_id: UUID, db: AsyncSession = Depends(get_db), user: U
 
     await db.execute(text("DELETE FROM files WHERE id = :fid"), {"fid": str(file_id)})
     await db.commit()
-    await _audit.write(db, user.id, "file.delete", "file", file_id, meta={"name": f.get("name")})
-
-    # best-effort object cleanup (DB delete already committed)
-    try:
-        from ..s3 import s3_internal_client
-        c = s3_internal_client()
-        for k in keys:
-            try:
-                c.delete_object(Bucket=settings.s3_bucket, Key=k)
-            except Exception:
-                pass
-    except Exception:
-        pass
+    bg.add_task(_audit.write_async, user.id, "file.delete", "file", file_id, meta={"name": f.get("name")})
+
+    # best-effort object cleanup (DB delete already committed); boto3 is
+    # sync, so keep the deletes off the event loop
+    def _cleanup():
+        try:
+            from ..s3 import s3_internal_client
+            c = s3_internal_client()
+            for k in keys:
+                try:
+                    c.delete_object(Bucket=settings.s3_bucket, Key=k)
+                except Exception:
+                    pass
+        except Exception:
+            pass
+
+    await asyncio.to_thread(_cleanup)
 
     return {"ok": True}
 
 
+_SAFE_RE = re.compile(r"[^a-zA-Z0-9._ -]+")
+
+
 def safe_name(name: str) -> str:
-    name = name.strip().replace("\\", "/").split("/")[-1]
-    name = re.sub(r"[^a-zA-Z0-9._ -]+", "_", name)
-    return name[:200] if len(name) > 200 else name
+    name = name.strip().replace("\\", "/").rpartition("/")[2]
+    return _SAFE_RE.sub("_", name)[:200]
 
 @router.post("", response_model=FileOut)
-async def create_file(req: FileCreate, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def create_file(req: FileCreate, bg: BackgroundTasks, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     result = await db.execute(text("""
         INSERT INTO files (project_id, kind, name, mime, size_bytes, created_by, created_at, updated_at)
         VALUES (:project_id, :kind, :name, :mime, :size_bytes, :created_by, now(), now())
@@ -192,8 +205,8 @@ async def create_file(req: FileCreate, db: AsyncSession = Depends(get_db), user:
     row = result.mappings().one()
     await db.commit()
     fid = row["id"]
-    await _audit.write(db, user.id, "file.create", "file", fid, meta={"kind": req.kind, "name": req.name})
-    return FileOut(**row)
+    bg.add_task(_audit.write_async, user.id, "file.create", "file", fid, meta={"kind": req.kind, "name": req.name})
+    return FileOut.model_construct(**row)
 
 @router.get("/{file_id}/metadata", response_model=FileMetadataOut)
 async def file_metadata(file_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
@@ -207,12 +220,12 @@ async def file_metadata(file_id: UUID, db: AsyncSession = Depends(get_db), user:
     row = result.mappings().one_or_none()
     if not row:
         raise HTTPException(404, "File not found")
-    return FileMetadataOut(**row)
+    return FileMetadataOut.model_construct(**row)
 
 @router.post("/{file_id}/versions/initiate-upload", response_model=InitiateUploadResponse)
-async def initiate_upload(file_id: UUID, req: InitiateUploadRequest, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
-    # Ensure bucket exists (dev)
-    ensure_bucket()
+async def initiate_upload(file_id: UUID, req: InitiateUploadRequest, bg: BackgroundTasks, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+    # Ensure bucket exists (dev); sync S3 round trip, so off the loop
+    await asyncio.to_thread(ensure_bucket)
 
     # Use an upload UUID in the object key so we don't need DB-side pending rows.
     upid = uuid.uuid4().hex
@@ -220,11 +233,11 @@ async def initiate_upload(file_id: UUID, req: InitiateUploadRequest, db: AsyncSe
     object_key = f"files/{file_id}/{upid}/{filename}"
 
     url, headers = presign_put(object_key, req.mime)
-    await _audit.write(db, user.id, "file.upload.initiate", "file", file_id, meta={"object_key": object_key, "size": req.size_bytes})
+    bg.add_task(_audit.write_async, user.id, "file.upload.initiate", "file", file_id, meta={"object_key": object_key, "size": req.size_bytes})
     return InitiateUploadResponse(object_key=object_key, url=url, headers=headers)
 
 @router.post("/{file_id}/versions/complete-upload", response_model=FileMetadataOut)
-async def complete_upload(file_id: UUID, req: CompleteUploadRequest, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def complete_upload(file_id: UUID, req: CompleteUploadRequest, bg: BackgroundTasks, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     # Determine next version_no
     q = await db.execute(text("""
         SELECT COALESCE(MAX(version_no), 0) AS maxv
@@ -260,20 +273,29 @@ async def complete_upload(file_id: UUID, req: CompleteUploadRequest, db: AsyncSe
     """), {"ver_id": ver_id, "size_bytes": req.size_bytes, "fid": str(file_id)})
 
     await db.commit()
-    await _audit.write(db, user.id, "file.upload.complete", "file_version", ver_id, meta={"file_id": str(file_id), "version_no": version_no})
+    bg.add_task(_audit.write_async, user.id, "file.upload.complete", "file_version", ver_id, meta={"file_id": str(file_id), "version_no": version_no})
 
     # Return updated metadata
     return await file_metadata(file_id, db, user)
 @router.get("/{file_id}/versions", response_model=list[FileVersionOut])
 async def list_versions(file_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     result = await db.execute(text("""
-        SELECT id, version_no, size_bytes, created_at, created_by
+        SELECT id, version_no, size_bytes, created_at, created_by, object_key
         FROM file_versions
         WHERE file_id = :fid
         ORDER BY version_no DESC
     """), {"fid": str(file_id)})
     rows = result.mappings().all()
-    return [FileVersionOut(**r) for r in rows]
+    # Presigning is local HMAC work, so the whole history gets download
+    # URLs in one pass — no per-version presign-download round trips.
+    urls = presign_get_many([r["object_key"] for r in rows])
+    return [
+        FileVersionOut.model_construct(
+            id=r["id"], version_no=r["version_no"], size_bytes=r["size_bytes"],
+            created_at=r["created_at"], created_by=r["created_by"], download_url=url,
+        )
+        for r, url in zip(rows, urls)
+    ]
 
 
 @router.post("/{file_id}/versions/{version_id}/presign-download", response_model=PresignDownloadResponse)
@@ -383,42 +405,12 @@ async def pdf_inline(file_id: UUID, db: AsyncSession = Depends(get_db), user: Us
     if not row:
         raise HTTPException(404, "File has no version yet")
 
-    # fetch from MinIO using INTERNAL client (server-side)
+    # fetch from MinIO using INTERNAL client (server-side); the GET blocks,
+    # so it runs in a thread while the loop keeps serving
     from ..s3 import s3_internal_client
     c = s3_internal_client()
-    obj = c.get_object(Bucket=settings.s3_bucket, Key=row["object_key"])
+    obj = await asyncio.to_thread(c.get_object, Bucket=settings.s3_bucket, Key=row["object_key"])
 
     filename = safe_name(row["name"] or "file.pdf")
     headers = {"Content-Disposition": f'inline; filename="{filename}"'}
     return StreamingResponse(obj["Body"].iter_chunks(), media_type="application/pdf", headers=headers)
-@router.get("/{file_id}/versions")
-async def list_versions(file_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
-    result = await db.execute(text("""
-        SELECT id, version_no, object_key, size_bytes, created_at, created_by
-        FROM file_versions
-        WHERE file_id = :fid
-        ORDER BY version_no DESC
-    """), {"fid": str(file_id)})
-    return result.mappings().all()
-@router.post("/{file_id}/versions/{version_id}/presign-download", response_model=PresignDownloadResponse)
-async def presign_download_version(file_id: UUID, version_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
-    q = await db.execute(text("""
-        SELECT f.name, f.mime, v.object_key
-        FROM files f
-        JOIN file_versions v ON v.id = :vid AND v.file_id = f.id
-        WHERE f.id = :fid
-    """), {"fid": str(file_id), "vid": str(version_id)})
-    row = q.mappings().one_or_none()
-    if not row:
-        raise HTTPException(404, "Version not found")
-
-    filename = safe_name(row["name"] or "file")
-    mime = row.get("mime")
-
-    url = presign_get(
-        row["object_key"],
-        response_content_type=mime,
-        response_content_disposition=f'inline; filename="{filename}"',
-    )
-    return PresignDownloadResponse(url=url)
-
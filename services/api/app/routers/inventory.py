@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from uuid import UUID
+from datetime import datetime
 
 from ..db import get_db
 from ..deps import get_current_user
@@ -15,9 +16,44 @@ from ..schemas import (
     SheetLotCreate, SheetLotOut, SheetLotView, SheetReserveReq,
     ProjectRequirementUpsert, ProjectRequirementOut,
     ProjectAvailabilityRow,
+    SUPPLIER_LIST, ITEM_LIST, STOCK_LOT_LIST, SHEET_LOT_LIST,
+    SHEET_LOT_VIEW_LIST, REQUIREMENT_LIST, dump_list,
 )
+from ..schemas_fast import (
+    json_encoder,
+    ItemOutMS, StockLotViewMS, ProjectAvailabilityRowMS,
+)
+from . import _etag
+from ._route import ORJSONRoute
+
+router = APIRouter(prefix="/inventory", tags=["inventory"], route_class=ORJSONRoute)
+
+MAX_PAGE = 500
+
+
+def _page_limit(limit: int) -> int:
+    return max(1, min(MAX_PAGE, int(limit or MAX_PAGE)))
+
+
+def _set_next_cursor(response: Response, rows: list, lim: int):
+    # Keyset cursor for the next page; only present when the page is full.
+    # created_at alone isn't unique, so id tie-breaks the boundary row —
+    # equal timestamps at a page edge would otherwise skip or repeat rows.
+    if response is not None and rows and len(rows) == lim:
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = f'{last["created_at"].isoformat()}|{last["id"]}'
 
-router = APIRouter(prefix="/inventory", tags=["inventory"])
+
+def _parse_cursor(cursor: str | None) -> tuple[datetime | None, UUID | None]:
+    # "created_at|id"; a bare timestamp from an older client still works
+    # (timestamp-only predicate, no tie-break).
+    if not cursor:
+        return None, None
+    ts, _, cid = cursor.partition("|")
+    try:
+        return datetime.fromisoformat(ts), (UUID(cid) if cid else None)
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
 
 
 # -----------------------------
@@ -25,13 +61,18 @@ router = APIRouter(prefix="/inventory", tags=["inventory"])
 # -----------------------------
 
 @router.get("/suppliers", response_model=list[SupplierOut])
-async def list_suppliers(db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def list_suppliers(request: Request, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     q = await db.execute(text("""
         SELECT id, name, phone, email, address, notes, created_at, updated_at
         FROM suppliers
         ORDER BY name ASC
     """))
-    return [SupplierOut(**r) for r in q.mappings().all()]
+    rows = q.mappings().all()
+
+    etag = _etag.compute(len(rows), max((r["updated_at"] for r in rows), default=None))
+    if _etag.matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(dump_list(SUPPLIER_LIST, rows), media_type="application/json", headers={"ETag": etag})
 
 
 @router.post("/suppliers", response_model=SupplierOut)
@@ -53,7 +94,7 @@ async def create_supplier(req: SupplierCreate, db: AsyncSession = Depends(get_db
     })
     row = q.mappings().one()
     await db.commit()
-    return SupplierOut(**row)
+    return SupplierOut.model_construct(**row)
 
 @router.put("/suppliers/{supplier_id}", response_model=SupplierOut)
 async def update_supplier(
@@ -78,7 +119,7 @@ async def update_supplier(
         WHERE id=:id
         RETURNING id, name, phone, email, address, notes, created_at, updated_at
     """), {
-        "id": str(supplier_id),
+        "id": supplier_id,
         "name": name,
         "phone": req.phone,
         "email": req.email,
@@ -91,7 +132,7 @@ async def update_supplier(
         raise HTTPException(404, "Supplier not found")
 
     await db.commit()
-    return SupplierOut(**row)
+    return SupplierOut.model_construct(**row)
 
 
 @router.delete("/suppliers/{supplier_id}")
@@ -100,7 +141,7 @@ async def delete_supplier(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    q = await db.execute(text("DELETE FROM suppliers WHERE id=:id"), {"id": str(supplier_id)})
+    q = await db.execute(text("DELETE FROM suppliers WHERE id=:id"), {"id": supplier_id})
     await db.commit()
     # rowcount is sometimes unreliable across drivers; returning ok regardless is fine
     return {"ok": True}
@@ -110,21 +151,25 @@ async def delete_supplier(
 # -----------------------------
 
 @router.get("/items", response_model=list[ItemOut])
-async def list_items(type: str | None = None, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def list_items(type: str | None = None, limit: int = MAX_PAGE, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     where = "WHERE is_active=true"
-    params: dict = {}
+    params: dict = {"lim": _page_limit(limit)}
     if type:
         where += " AND type=:type"
         params["type"] = type
 
     q = await db.execute(text(f"""
-        SELECT id, sku, name, category, type, uom, default_supplier_id, min_stock, is_active, created_at, updated_at
+        SELECT id, sku, name, category, type, uom, default_supplier_id, min_stock::float8 as min_stock, is_active, created_at, updated_at
         FROM items
         {where}
         ORDER BY type ASC, name ASC
-        LIMIT 500
+        LIMIT :lim
     """), params)
-    return [ItemOut(**r) for r in q.mappings().all()]
+    # Trusted DB output: skip per-row Pydantic validation and encode via msgspec.
+    return Response(
+        json_encoder.encode([ItemOutMS(**r) for r in q.mappings().all()]),
+        media_type="application/json",
+    )
 
 
 @router.get("/items/search", response_model=list[ItemOut])
@@ -146,7 +191,7 @@ async def search_items(q: str = "", limit: int = 30, db: AsyncSession = Depends(
           name ASC
         LIMIT :lim
     """), {"like": like, "lim": lim, "term": term, "term_prefix": f"{term.lower()}%"})
-    return [ItemOut(**r) for r in res.mappings().all()]
+    return Response(dump_list(ITEM_LIST, res.mappings().all()), media_type="application/json")
 
 
 @router.post("/items", response_model=ItemOut)
@@ -169,12 +214,12 @@ async def create_item(req: ItemCreate, db: AsyncSession = Depends(get_db), user:
         "category": req.category,
         "type": itype,
         "uom": req.uom or "pcs",
-        "default_supplier_id": str(req.default_supplier_id) if req.default_supplier_id else None,
+        "default_supplier_id": req.default_supplier_id,
         "min_stock": req.min_stock,
     })
     row = q.mappings().one()
     await db.commit()
-    return ItemOut(**row)
+    return ItemOut.model_construct(**row)
 @router.put("/items/{item_id}", response_model=ItemOut)
 async def update_item(item_id: UUID, req: ItemUpdate, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     sku = (req.sku or "").strip()
@@ -201,13 +246,13 @@ async def update_item(item_id: UUID, req: ItemUpdate, db: AsyncSession = Depends
         WHERE id=:id
         RETURNING id, sku, name, category, type, uom, default_supplier_id, min_stock, is_active, created_at, updated_at
     """), {
-        "id": str(item_id),
+        "id": item_id,
         "sku": sku,
         "name": name,
         "category": req.category,
         "type": itype,
         "uom": req.uom or "pcs",
-        "default_supplier_id": str(req.default_supplier_id) if req.default_supplier_id else None,
+        "default_supplier_id": req.default_supplier_id,
         "min_stock": req.min_stock,
         "is_active": bool(req.is_active),
     })
@@ -217,7 +262,7 @@ async def update_item(item_id: UUID, req: ItemUpdate, db: AsyncSession = Depends
         raise HTTPException(404, "Item not found")
 
     await db.commit()
-    return ItemOut(**row)
+    return ItemOut.model_construct(**row)
 
 
 @router.post("/items/{item_id}/deactivate", response_model=ItemOut)
@@ -227,14 +272,14 @@ async def deactivate_item(item_id: UUID, db: AsyncSession = Depends(get_db), use
         SET is_active=false, updated_at=now()
         WHERE id=:id
         RETURNING id, sku, name, category, type, uom, default_supplier_id, min_stock, is_active, created_at, updated_at
-    """), {"id": str(item_id)})
+    """), {"id": item_id})
 
     row = q.mappings().first()
     if not row:
         raise HTTPException(404, "Item not found")
 
     await db.commit()
-    return ItemOut(**row)
+    return ItemOut.model_construct(**row)
 
 
 # -----------------------------
@@ -251,7 +296,7 @@ async def receive_stock(req: StockLotReceive, db: AsyncSession = Depends(get_db)
         VALUES (:item_id, :location, :qty, 0, :unit_cost, 'purchase', :ref, now(), now())
         RETURNING id, item_id, location, qty_on_hand, qty_reserved, unit_cost, source, ref, created_at, updated_at
     """), {
-        "item_id": str(req.item_id),
+        "item_id": req.item_id,
         "location": req.location,
         "qty": req.qty,
         "unit_cost": req.unit_cost,
@@ -259,29 +304,65 @@ async def receive_stock(req: StockLotReceive, db: AsyncSession = Depends(get_db)
     })
     row = q.mappings().one()
     await db.commit()
-    return StockLotOut(**row)
+    return StockLotOut.model_construct(**row)
 
 
 @router.get("/stock", response_model=list[StockLotOut])
-async def list_stock(item_id: UUID | None = None, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
-    where = ""
-    params: dict = {}
+async def list_stock(
+    item_id: UUID | None = None,
+    cursor: str | None = None,
+    limit: int = MAX_PAGE,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    lim = _page_limit(limit)
+    where = ["true"]
+    params: dict = {"lim": lim}
     if item_id:
-        where = "WHERE item_id=:item_id"
-        params["item_id"] = str(item_id)
+        where.append("item_id=:item_id")
+        params["item_id"] = item_id
+    cur_ts, cur_id = _parse_cursor(cursor)
+    if cur_ts is not None:
+        if cur_id is not None:
+            where.append("(created_at, id) > (:cur_ts, :cur_id)")
+            params["cur_id"] = cur_id
+        else:
+            where.append("created_at > :cur_ts")
+        params["cur_ts"] = cur_ts
 
+    w = " AND ".join(where)
     q = await db.execute(text(f"""
         SELECT id, item_id, location, qty_on_hand, qty_reserved, unit_cost, source, ref, created_at, updated_at
         FROM stock_lots
-        {where}
-        ORDER BY created_at ASC
-        LIMIT 500
+        WHERE {w}
+        ORDER BY created_at ASC, id ASC
+        LIMIT :lim
     """), params)
-    return [StockLotOut(**r) for r in q.mappings().all()]
+    rows = q.mappings().all()
+    resp = Response(dump_list(STOCK_LOT_LIST, rows), media_type="application/json")
+    _set_next_cursor(resp, rows, lim)
+    return resp
 
 @router.get("/stock/view", response_model=list[StockLotView])
-async def list_stock_view(db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
-    q = await db.execute(text("""
+async def list_stock_view(
+    cursor: str | None = None,
+    limit: int = MAX_PAGE,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    lim = _page_limit(limit)
+    where = ""
+    params: dict = {"lim": lim}
+    cur_ts, cur_id = _parse_cursor(cursor)
+    if cur_ts is not None:
+        if cur_id is not None:
+            where = "WHERE (sl.created_at, sl.id) < (:cur_ts, :cur_id)"
+            params["cur_id"] = cur_id
+        else:
+            where = "WHERE sl.created_at < :cur_ts"
+        params["cur_ts"] = cur_ts
+
+    q = await db.execute(text(f"""
         SELECT
           sl.id,
           sl.item_id,
@@ -292,17 +373,24 @@ async def list_stock_view(db: AsyncSession = Depends(get_db), user: User = Depen
           sl.location,
           sl.qty_on_hand::float8 as qty_on_hand,
           sl.qty_reserved::float8 as qty_reserved,
-          sl.unit_cost,
+          sl.unit_cost::float8 as unit_cost,
           sl.source,
           sl.ref,
           sl.created_at,
           sl.updated_at
         FROM stock_lots sl
         JOIN items i ON i.id = sl.item_id
-        ORDER BY sl.created_at DESC
-        LIMIT 500
-    """))
-    return [StockLotView(**r) for r in q.mappings().all()]
+        {where}
+        ORDER BY sl.created_at DESC, sl.id DESC
+        LIMIT :lim
+    """), params)
+    rows = q.mappings().all()
+    resp = Response(
+        json_encoder.encode([StockLotViewMS(**r) for r in rows]),
+        media_type="application/json",
+    )
+    _set_next_cursor(resp, rows, lim)
+    return resp
 
 # -----------------------------
 # Sheets / Remnants (Phase 2 UI later)
@@ -335,7 +423,7 @@ async def create_sheet_lot(req: SheetLotCreate, db: AsyncSession = Depends(get_d
           location, tag_code, project_origin_id, reserved_for_project_id,
           source, unit_cost, created_at, updated_at
     """), {
-        "material_item_id": str(req.material_item_id),
+        "material_item_id": req.material_item_id,
         "thickness_mm": req.thickness_mm,
         "w_mm": req.w_mm,
         "h_mm": req.h_mm,
@@ -343,24 +431,40 @@ async def create_sheet_lot(req: SheetLotCreate, db: AsyncSession = Depends(get_d
         "usable": bool(req.usable),
         "location": req.location,
         "tag_code": req.tag_code,
-        "project_origin_id": str(req.project_origin_id) if req.project_origin_id else None,
+        "project_origin_id": req.project_origin_id,
         "source": src,
         "unit_cost": req.unit_cost,
     })
     row = q.mappings().one()
     await db.commit()
-    return SheetLotOut(**row)
+    return SheetLotOut.model_construct(**row)
 
 
 @router.get("/sheets", response_model=list[SheetLotOut])
-async def list_sheet_lots(material_item_id: UUID | None = None, only_available: bool = True, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def list_sheet_lots(
+    material_item_id: UUID | None = None,
+    only_available: bool = True,
+    cursor: str | None = None,
+    limit: int = MAX_PAGE,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    lim = _page_limit(limit)
     where = ["usable=true"]
-    params: dict = {}
+    params: dict = {"lim": lim}
     if material_item_id:
         where.append("material_item_id=:mid")
-        params["mid"] = str(material_item_id)
+        params["mid"] = material_item_id
     if only_available:
         where.append("reserved_for_project_id IS NULL")
+    cur_ts, cur_id = _parse_cursor(cursor)
+    if cur_ts is not None:
+        if cur_id is not None:
+            where.append("(created_at, id) < (:cur_ts, :cur_id)")
+            params["cur_id"] = cur_id
+        else:
+            where.append("created_at < :cur_ts")
+        params["cur_ts"] = cur_ts
 
     w = " AND ".join(where)
     q = await db.execute(text(f"""
@@ -370,10 +474,13 @@ async def list_sheet_lots(material_item_id: UUID | None = None, only_available:
           source, unit_cost, created_at, updated_at
         FROM sheet_lots
         WHERE {w}
-        ORDER BY created_at DESC
-        LIMIT 500
+        ORDER BY created_at DESC, id DESC
+        LIMIT :lim
     """), params)
-    return [SheetLotOut(**r) for r in q.mappings().all()]
+    rows = q.mappings().all()
+    resp = Response(dump_list(SHEET_LOT_LIST, rows), media_type="application/json")
+    _set_next_cursor(resp, rows, lim)
+    return resp
 
 
 # -----------------------------
@@ -387,8 +494,8 @@ async def list_requirements(project_id: UUID, db: AsyncSession = Depends(get_db)
         FROM project_requirements
         WHERE project_id=:pid
         ORDER BY updated_at DESC
-    """), {"pid": str(project_id)})
-    return [ProjectRequirementOut(**r) for r in q.mappings().all()]
+    """), {"pid": project_id})
+    return Response(dump_list(REQUIREMENT_LIST, q.mappings().all()), media_type="application/json")
 
 
 @router.post("/projects/{project_id}/requirements", response_model=ProjectRequirementOut)
@@ -406,15 +513,58 @@ async def upsert_requirement(project_id: UUID, req: ProjectRequirementUpsert, db
         DO UPDATE SET qty_required=excluded.qty_required, notes=excluded.notes, source=excluded.source, updated_at=now()
         RETURNING id, project_id, item_id, qty_required::float8 as qty_required, notes, source, updated_at
     """), {
-        "pid": str(project_id),
-        "item_id": str(req.item_id),
+        "pid": project_id,
+        "item_id": req.item_id,
         "qty": req.qty_required,
         "notes": req.notes,
         "source": src,
     })
     row = q.mappings().one()
     await db.commit()
-    return ProjectRequirementOut(**row)
+    return ProjectRequirementOut.model_construct(**row)
+
+
+@router.post("/projects/{project_id}/requirements/bulk", response_model=list[ProjectRequirementOut])
+async def upsert_requirements_bulk(project_id: UUID, reqs: list[ProjectRequirementUpsert], db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+    if not reqs:
+        return []
+
+    # Dedupe by item_id (last line wins): imported BOMs can repeat an item,
+    # and ON CONFLICT DO UPDATE errors if one statement hits a row twice.
+    by_item: dict = {}
+    for r in reqs:
+        if r.qty_required < 0:
+            raise HTTPException(400, "qty_required must be >= 0")
+        src = (r.source or "manual").strip().lower()
+        if src not in {"manual", "import", "nesting", "template"}:
+            raise HTTPException(400, "Invalid source")
+        by_item[r.item_id] = (r, src)
+    deduped = list(by_item.values())
+
+    # One round trip for the whole BOM: bind parallel arrays and unnest them
+    # server-side instead of issuing one upsert per line.
+    q = await db.execute(text("""
+        INSERT INTO project_requirements (project_id, item_id, qty_required, notes, source, created_at, updated_at)
+        SELECT :pid, u.item_id, u.qty, u.notes, u.source, now(), now()
+        FROM unnest(
+          CAST(:item_ids AS uuid[]),
+          CAST(:qtys AS float8[]),
+          CAST(:notes AS text[]),
+          CAST(:sources AS text[])
+        ) AS u(item_id, qty, notes, source)
+        ON CONFLICT (project_id, item_id)
+        DO UPDATE SET qty_required=excluded.qty_required, notes=excluded.notes, source=excluded.source, updated_at=now()
+        RETURNING id, project_id, item_id, qty_required::float8 as qty_required, notes, source, updated_at
+    """), {
+        "pid": project_id,
+        "item_ids": [r.item_id for r, _ in deduped],
+        "qtys": [r.qty_required for r, _ in deduped],
+        "notes": [r.notes for r, _ in deduped],
+        "sources": [src for _, src in deduped],
+    })
+    rows = q.mappings().all()
+    await db.commit()
+    return [ProjectRequirementOut.model_construct(**r) for r in rows]
 
 
 @router.delete("/projects/{project_id}/requirements/{item_id}")
@@ -422,7 +572,7 @@ async def delete_requirement(project_id: UUID, item_id: UUID, db: AsyncSession =
     await db.execute(text("""
         DELETE FROM project_requirements
         WHERE project_id=:pid AND item_id=:iid
-    """), {"pid": str(project_id), "iid": str(item_id)})
+    """), {"pid": project_id, "iid": item_id})
     await db.commit()
     return {"ok": True}
 
@@ -432,7 +582,7 @@ async def delete_requirement(project_id: UUID, item_id: UUID, db: AsyncSession =
 # -----------------------------
 
 @router.get("/projects/{project_id}/availability", response_model=list[ProjectAvailabilityRow])
-async def project_availability(project_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def project_availability(project_id: UUID, request: Request, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     q = await db.execute(text("""
         WITH req AS (
           SELECT pr.item_id, pr.qty_required
@@ -460,23 +610,41 @@ async def project_availability(project_id: UUID, db: AsyncSession = Depends(get_
         JOIN items i ON i.id = req.item_id
         LEFT JOIN stock ON stock.item_id = i.id
         ORDER BY i.type ASC, i.name ASC
-    """), {"pid": str(project_id)})
+    """), {"pid": project_id})
+
+    payload = json_encoder.encode([ProjectAvailabilityRowMS(**r) for r in q.mappings().all()])
 
-    return [ProjectAvailabilityRow(**r) for r in q.mappings().all()]
+    # No updated_at column to key on here, so hash the payload itself —
+    # repeat polls still skip the body when nothing changed.
+    etag = _etag.compute(payload)
+    if _etag.matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(payload, media_type="application/json", headers={"ETag": etag})
 @router.get("/sheets/view", response_model=list[SheetLotView])
 async def list_sheet_lots_view(
     material_item_id: UUID | None = None,
     only_available: bool = True,
+    cursor: str | None = None,
+    limit: int = MAX_PAGE,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
+    lim = _page_limit(limit)
     where = ["sl.usable=true"]
-    params: dict = {}
+    params: dict = {"lim": lim}
     if material_item_id:
         where.append("sl.material_item_id=:mid")
-        params["mid"] = str(material_item_id)
+        params["mid"] = material_item_id
     if only_available:
         where.append("sl.reserved_for_project_id IS NULL")
+    cur_ts, cur_id = _parse_cursor(cursor)
+    if cur_ts is not None:
+        if cur_id is not None:
+            where.append("(sl.created_at, sl.id) < (:cur_ts, :cur_id)")
+            params["cur_id"] = cur_id
+        else:
+            where.append("sl.created_at < :cur_ts")
+        params["cur_ts"] = cur_ts
 
     w = " AND ".join(where)
     q = await db.execute(text(f"""
@@ -501,11 +669,14 @@ async def list_sheet_lots_view(
         FROM sheet_lots sl
         JOIN items i ON i.id = sl.material_item_id
         WHERE {w}
-        ORDER BY sl.created_at DESC
-        LIMIT 500
+        ORDER BY sl.created_at DESC, sl.id DESC
+        LIMIT :lim
     """), params)
 
-    return [SheetLotView(**r) for r in q.mappings().all()]
+    rows = q.mappings().all()
+    resp = Response(dump_list(SHEET_LOT_VIEW_LIST, rows), media_type="application/json")
+    _set_next_cursor(resp, rows, lim)
+    return resp
 
 
 @router.put("/sheets/{sheet_id}/reserve", response_model=SheetLotOut)
@@ -518,13 +689,13 @@ async def reserve_sheet(sheet_id: UUID, req: SheetReserveReq, db: AsyncSession =
           id, material_item_id, thickness_mm, w_mm, h_mm, qty, usable,
           location, tag_code, project_origin_id, reserved_for_project_id,
           source, unit_cost, created_at, updated_at
-    """), {"id": str(sheet_id), "pid": str(req.project_id)})
+    """), {"id": sheet_id, "pid": req.project_id})
 
     row = q.mappings().first()
     if not row:
         raise HTTPException(404, "Sheet lot not found")
     await db.commit()
-    return SheetLotOut(**row)
+    return SheetLotOut.model_construct(**row)
 
 
 @router.put("/sheets/{sheet_id}/unreserve", response_model=SheetLotOut)
@@ -537,10 +708,10 @@ async def unreserve_sheet(sheet_id: UUID, db: AsyncSession = Depends(get_db), us
           id, material_item_id, thickness_mm, w_mm, h_mm, qty, usable,
           location, tag_code, project_origin_id, reserved_for_project_id,
           source, unit_cost, created_at, updated_at
-    """), {"id": str(sheet_id)})
+    """), {"id": sheet_id})
 
     row = q.mappings().first()
     if not row:
         raise HTTPException(404, "Sheet lot not found")
     await db.commit()
-    return SheetLotOut(**row)
+    return SheetLotOut.model_construct(**row)
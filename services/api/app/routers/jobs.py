@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from uuid import UUID
@@ -7,40 +10,116 @@ from ..models import User
 from ..schemas import JobCreate, JobOut
 from ..deps import get_current_user
 from ..queue import enqueue_job
-from . import _audit
+from . import _etag, _listen
+from ._route import ORJSONRoute
 
-router = APIRouter(prefix="/jobs", tags=["jobs"])
+router = APIRouter(prefix="/jobs", tags=["jobs"], route_class=ORJSONRoute)
 
 @router.post("", response_model=JobOut)
 async def create_job(req: JobCreate, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+    # Job INSERT + audit INSERT fused into one statement so both land in the
+    # same transaction and cost a single round trip.
     result = await db.execute(text("""
-        INSERT INTO jobs (type, status, progress_pct, stage, payload, result, created_by, created_at, updated_at)
-        VALUES (:type, 'queued', 0, NULL, :payload::jsonb, '{}'::jsonb, :created_by, now(), now())
-        RETURNING id, type, status, progress_pct, stage, result, error, updated_at
+        WITH j AS (
+          INSERT INTO jobs (type, status, progress_pct, stage, payload, result, created_by, created_at, updated_at)
+          VALUES (:type, 'queued', 0, NULL, :payload::jsonb, '{}'::jsonb, :created_by, now(), now())
+          RETURNING id, type, status, progress_pct, stage, result, error, updated_at
+        ), a AS (
+          INSERT INTO audit_log (ts, user_id, action, entity_type, entity_id, meta)
+          SELECT now(), :created_by, 'job.create', 'job', j.id, jsonb_build_object('type', :type)
+          FROM j
+        )
+        SELECT id, type, status, progress_pct, stage, result, error, updated_at FROM j
     """), {
         "type": req.type,
         "payload": json_dumps(req.payload),
-        "created_by": str(user.id),
+        "created_by": user.id,
     })
     row = result.mappings().one()
     await db.commit()
 
-    job_id = UUID(row["id"])
-    enqueue_job(str(job_id))
-    await _audit.write(db, user.id, "job.create", "job", job_id, meta={"type": req.type})
-    return JobOut(**row)
+    # RQ's client is sync; run it off the event loop after the commit.
+    await asyncio.to_thread(enqueue_job, str(row["id"]))
+    return JobOut.model_construct(**row)
 
 @router.get("/{job_id}", response_model=JobOut)
-async def get_job(job_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def get_job(job_id: UUID, request: Request, response: Response, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     q = await db.execute(text("""
         SELECT id, type, status, progress_pct, stage, result, error, updated_at
         FROM jobs
         WHERE id = :id
-    """), {"id": str(job_id)})
+    """), {"id": job_id})
     row = q.mappings().one_or_none()
     if not row:
         raise HTTPException(404, "Job not found")
-    return JobOut(**row)
+
+    # Pollers get a 304 with no body while the job state hasn't moved.
+    etag = _etag.compute(row["status"], row["progress_pct"], row["stage"], row["updated_at"])
+    if _etag.matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return JobOut.model_construct(**row)
+
+@router.get("/{job_id}/events")
+async def job_events(job_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+    # Push-based alternative to polling get_job: subscribe on the shared
+    # LISTEN connection and stream worker NOTIFYs as server-sent events
+    # until a terminal state.
+    channel = f"job_{job_id.hex}"
+
+    # Subscribe first so nothing is missed between SELECT and LISTEN.
+    queue = await _listen.subscribe(channel)
+    try:
+        q = await db.execute(text("""
+            SELECT status, progress_pct, stage, error, updated_at
+            FROM jobs
+            WHERE id = :id
+        """), {"id": job_id})
+        row = q.mappings().one_or_none()
+    except BaseException:
+        await _listen.unsubscribe(channel, queue)
+        raise
+    finally:
+        # Release the pooled session before streaming: FastAPI tears down
+        # yield-dependencies only after the response completes, which would
+        # pin this connection idle-in-transaction for the stream's lifetime.
+        await db.close()
+
+    async def stream():
+        try:
+            if row is None:
+                yield 'event: error\ndata: {"error":"Job not found"}\n\n'
+                return
+
+            snapshot = {
+                "id": str(job_id),
+                "status": row["status"],
+                "progress_pct": row["progress_pct"],
+                "stage": row["stage"],
+                "error": row["error"],
+            }
+            yield f"data: {json_dumps(snapshot)}\n\n"
+            if row["status"] in ("succeeded", "failed"):
+                return
+
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=15.0)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {payload}\n\n"
+                try:
+                    import json
+                    if json.loads(payload).get("status") in ("succeeded", "failed"):
+                        return
+                except Exception:
+                    pass
+        finally:
+            await _listen.unsubscribe(channel, queue)
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
 
 def json_dumps(obj):
     import json
@@ -1,17 +1,29 @@
 from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException
+from redis import asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from uuid import UUID
+from ..core.config import settings
 from ..db import get_db
 from ..models import User
 from ..schemas import LockAcquireRequest, LockOut, LockReleaseRequest
 from ..deps import get_current_user
-from . import _audit
 
-router = APIRouter(prefix="/locks", tags=["locks"])
+from ._route import ORJSONRoute
+
+router = APIRouter(prefix="/locks", tags=["locks"], route_class=ORJSONRoute)
 
 LEASE_MINUTES = 15
+LEASE_MS = LEASE_MINUTES * 60 * 1000
+# How often a Redis-served heartbeat also refreshes the DB fallback row.
+DB_REFRESH_SECONDS = 60
+
+_redis = aioredis.Redis.from_url(settings.redis_url, decode_responses=True)
+
+
+def _lock_key(lock_id) -> str:
+    return f"locks:{lock_id}"
 
 @router.post("/acquire", response_model=LockOut)
 async def acquire(req: LockAcquireRequest, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
@@ -24,58 +36,124 @@ async def acquire(req: LockAcquireRequest, db: AsyncSession = Depends(get_db), u
         FROM locks
         WHERE file_id = :fid AND active = true
         LIMIT 1
-    """), {"fid": str(req.file_id)})
+    """), {"fid": req.file_id})
     existing = q.mappings().one_or_none()
     if existing and existing["expires_at"] > now and str(existing["locked_by"]) == str(user.id):
-        return LockOut(**existing)
+        return LockOut.model_construct(**existing)
 
     if existing:
         # auto-expire stale locks
         if existing["expires_at"] <= now:
-            await db.execute(text("UPDATE locks SET active=false WHERE id=:id"), {"id": str(existing["id"])})
+            await db.execute(text("UPDATE locks SET active=false WHERE id=:id"), {"id": existing["id"]})
             await db.commit()
+            # Tear down the old holder's Redis lease too: it may outlive the
+            # DB row, and leaving it lets their heartbeats keep succeeding on
+            # the fast path while someone else holds the lock.
+            try:
+                stale = _lock_key(existing["id"])
+                await _redis.delete(stale, f"{stale}:dbsync")
+            except Exception:
+                pass
         else:
             if str(existing["locked_by"]) != str(user.id):
                 raise HTTPException(409, detail={"message": "Locked", "locked_by": existing["locked_by"], "expires_at": existing["expires_at"]})
 
-    # Create lock
+    # Create lock; the audit row rides the same transaction via the CTE.
     result = await db.execute(text("""
-        INSERT INTO locks (file_id, locked_by, locked_at, expires_at, client_id, mode, active)
-        VALUES (:fid, :uid, now(), :expires, :client_id, 'exclusive', true)
-        RETURNING id, file_id, locked_by, expires_at, active
-    """), {"fid": str(req.file_id), "uid": str(user.id), "expires": expires, "client_id": req.client_id})
+        WITH l AS (
+          INSERT INTO locks (file_id, locked_by, locked_at, expires_at, client_id, mode, active)
+          VALUES (:fid, :uid, now(), :expires, :client_id, 'exclusive', true)
+          RETURNING id, file_id, locked_by, expires_at, active
+        ), a AS (
+          INSERT INTO audit_log (ts, user_id, action, entity_type, entity_id, meta)
+          SELECT now(), :uid, 'lock.acquire', 'lock', l.id,
+                 jsonb_build_object('file_id', :fid, 'client_id', :client_id)
+          FROM l
+        )
+        SELECT id, file_id, locked_by, expires_at, active FROM l
+    """), {"fid": req.file_id, "uid": user.id, "expires": expires, "client_id": req.client_id})
     row = result.mappings().one()
     await db.commit()
-    lock_id = row["id"]
-    await _audit.write(db, user.id, "lock.acquire", "lock", lock_id, meta={"file_id": str(req.file_id), "client_id": req.client_id})
-    return LockOut(**row)
+
+    # Mirror the lease into Redis so heartbeats become an O(1) PEXPIRE
+    # instead of a row UPDATE. Best-effort: the DB row stays authoritative.
+    try:
+        await _redis.set(_lock_key(row["id"]), f'{row["file_id"]}|{row["locked_by"]}', px=LEASE_MS)
+    except Exception:
+        pass
+    return LockOut.model_construct(**row)
 
 @router.post("/heartbeat", response_model=LockOut)
 async def heartbeat(lock_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     now = datetime.now(timezone.utc)
     expires = now + timedelta(minutes=LEASE_MINUTES)
+
+    # Fast path: refresh the lease in Redis, skipping the WAL-generating
+    # UPDATE for keepalive timers. The DB row is only refreshed once per
+    # DB_REFRESH_SECONDS so it stays a usable fallback after a Redis flush.
+    try:
+        key = _lock_key(lock_id)
+        val = await _redis.get(key)
+        if val:
+            fid, uid = val.split("|", 1)
+            if uid != str(user.id):
+                raise HTTPException(404, "Lock not found")
+            await _redis.pexpire(key, LEASE_MS)
+            if await _redis.set(f"{key}:dbsync", "1", nx=True, ex=DB_REFRESH_SECONDS):
+                res = await db.execute(text("""
+                    UPDATE locks SET expires_at = :expires
+                    WHERE id = :id AND active = true AND locked_by = :uid
+                """), {"id": lock_id, "expires": expires, "uid": user.id})
+                await db.commit()
+                if res.rowcount == 0:
+                    # DB row gone or reassigned (e.g. auto-expired by another
+                    # acquire): the Redis lease is stale, drop it and refuse.
+                    await _redis.delete(key, f"{key}:dbsync")
+                    raise HTTPException(404, "Lock not found")
+            return LockOut.model_construct(id=lock_id, file_id=UUID(fid), locked_by=user.id, expires_at=expires, active=True)
+    except HTTPException:
+        raise
+    except Exception:
+        pass
+
     result = await db.execute(text("""
         UPDATE locks
         SET expires_at = :expires
         WHERE id = :id AND active = true AND locked_by = :uid
         RETURNING id, file_id, locked_by, expires_at, active
-    """), {"id": str(lock_id), "expires": expires, "uid": str(user.id)})
+    """), {"id": lock_id, "expires": expires, "uid": user.id})
     row = result.mappings().one_or_none()
     if not row:
         raise HTTPException(404, "Lock not found")
     await db.commit()
-    return LockOut(**row)
+    # Repopulate the Redis lease for the next heartbeat.
+    try:
+        await _redis.set(_lock_key(row["id"]), f'{row["file_id"]}|{row["locked_by"]}', px=LEASE_MS)
+    except Exception:
+        pass
+    return LockOut.model_construct(**row)
 
 @router.post("/release")
 async def release(req: LockReleaseRequest, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     result = await db.execute(text("""
-        UPDATE locks SET active=false
-        WHERE id = :id AND locked_by = :uid AND active = true
-        RETURNING id, file_id
-    """), {"id": str(req.lock_id), "uid": str(user.id)})
+        WITH l AS (
+          UPDATE locks SET active=false
+          WHERE id = :id AND locked_by = :uid AND active = true
+          RETURNING id, file_id
+        ), a AS (
+          INSERT INTO audit_log (ts, user_id, action, entity_type, entity_id, meta)
+          SELECT now(), :uid, 'lock.release', 'lock', l.id,
+                 jsonb_build_object('file_id', l.file_id)
+          FROM l
+        )
+        SELECT id, file_id FROM l
+    """), {"id": req.lock_id, "uid": user.id})
     row = result.mappings().one_or_none()
     if not row:
         raise HTTPException(404, "Lock not found")
     await db.commit()
-    await _audit.write(db, user.id, "lock.release", "lock", row["id"], meta={"file_id": row["file_id"]})
+    try:
+        await _redis.delete(_lock_key(row["id"]), f'{_lock_key(row["id"])}:dbsync')
+    except Exception:
+        pass
     return {"ok": True}
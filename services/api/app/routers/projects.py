@@ -1,123 +1,242 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import io
 import mimetypes
+import os
 import re
 import uuid
 from pathlib import Path
+from typing import NamedTuple
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text, inspect
+from sqlalchemy import text, inspect
 from uuid import UUID
 
 from ..core.config import settings
 from ..db import get_db
-from ..models import Project, User
+from ..models import User
 from datetime import date, timedelta
 import json
 
-from ..schemas import ProjectCreate, ProjectUpdate, ProjectOut
+from ..schemas import ProjectCreate, ProjectUpdate, ProjectOut, PROJECT_LIST, dump_list
 from ..deps import get_current_user
-from ..s3 import ensure_bucket, s3_internal_client
+from ..s3 import ensure_bucket, s3_internal_client, transfer_config
 from . import _audit
+from ._route import ORJSONRoute
 
-router = APIRouter(prefix="/projects", tags=["projects"])
+router = APIRouter(prefix="/projects", tags=["projects"], route_class=ORJSONRoute)
 
 
-def _missing_items_str(v):
-    if v is None:
-        return None
-    if isinstance(v, str):
-        return v
-    try:
-        return json.dumps(v)
-    except Exception:
-        return str(v)
+def _build_eta_lut() -> dict[tuple[int, int], int]:
+    # calendar days needed to add `rem` non-Friday days from each start
+    # weekday, derived from the original day-by-day loop
+    lut = {}
+    for w in range(7):
+        for rem in range(1, 7):
+            days = 0
+            wd = w
+            remaining = rem
+            while remaining > 0:
+                days += 1
+                wd = (wd + 1) % 7
+                if wd == 4:  # Friday
+                    continue
+                remaining -= 1
+            lut[(w, rem)] = days
+    return lut
+
+
+_ETA_LUT = _build_eta_lut()
+
 
 def _calc_eta_skip_fridays(payment_date: date | None, max_days_to_finish: int | None) -> date | None:
-    """Compute ETA by adding working days, skipping Fridays only."""
+    """Compute ETA by adding working days, skipping Fridays only.
+
+    O(1): the first partial week comes from a lookup table; every 6
+    working days after that (always landing on a non-Friday) is exactly 7
+    calendar days.
+    """
     if not payment_date or not max_days_to_finish or max_days_to_finish <= 0:
         return None
 
-    d = payment_date
-    remaining = max_days_to_finish
-    while remaining > 0:
-        d = d + timedelta(days=1)
-        # Monday=0 ... Friday=4
-        if d.weekday() == 4:
-            continue
-        remaining -= 1
-    return d
+    full_weeks, rem = divmod(max_days_to_finish, 6)
+    if rem == 0:
+        full_weeks -= 1
+        rem = 6
+    return payment_date + timedelta(
+        days=_ETA_LUT[(payment_date.weekday(), rem)] + 7 * full_weeks
+    )
+
+_SAFE_RE = re.compile(r"[^a-zA-Z0-9._ -]+")
+
+# Static extension -> MIME table built once at import: the registry's
+# entries first, then our overrides on top (mimetypes is often missing
+# office types on Linux containers). Lookups never touch the registry.
+_MIME: dict[str, str] = {ext.lstrip(".").lower(): mt for ext, mt in mimetypes.types_map.items()}
+_MIME.update({
+    "pdf": "application/pdf",
+    "doc": "application/msword",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "xls": "application/vnd.ms-excel",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+})
+
 
 def safe_name(name: str) -> str:
-    name = name.strip().replace("\\", "/").split("/")[-1]
-    name = re.sub(r"[^a-zA-Z0-9._ -]+", "_", name)
-    return name[:200] if len(name) > 200 else name
+    name = name.strip().replace("\\", "/").rpartition("/")[2]
+    return _SAFE_RE.sub("_", name)[:200]
 
 
 def _guess_mime(filename: str) -> str:
-    ext = filename.lower().split(".")[-1] if "." in filename else ""
-    # mimetypes is often missing office types on Linux containers
-    override = {
-        "pdf": "application/pdf",
-        "doc": "application/msword",
-        "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        "xls": "application/vnd.ms-excel",
-        "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        "png": "image/png",
-        "jpg": "image/jpeg",
-        "jpeg": "image/jpeg",
-        "webp": "image/webp",
-    }
-    if ext in override:
-        return override[ext]
-
-    mt, _ = mimetypes.guess_type(filename)
-    return mt or "application/octet-stream"
+    i = filename.rfind(".")
+    if i < 0:
+        return "application/octet-stream"
+    return _MIME.get(filename[i + 1:].lower(), "application/octet-stream")
 
 
 def _template_root() -> Path:
     # app/routers/projects.py -> app/
     return Path(__file__).resolve().parents[1] / "templates" / "project_default"
 
-def _calc_eta_skip_fridays(payment_date: date | None, max_days_to_finish: int | None) -> date | None:
-    if not payment_date or not max_days_to_finish or max_days_to_finish <= 0:
-        return None
-    d = payment_date
-    remaining = max_days_to_finish
-    while remaining > 0:
-        d = d + timedelta(days=1)
-        if d.weekday() == 4:  # Friday
-            continue
-        remaining -= 1
-    return d
+# common naming styles + your exact folder name from the template zip,
+# flattened into one alias table so classification is a single dict lookup
+_KIND_ALIAS = {a: "commercial" for a in (
+    "commercial", "invoices", "invoice", "contracts", "contract",
+    "invoices & contracts", "invoices & contract", "invoices and contracts",
+)}
+_KIND_ALIAS.update({a: "technical" for a in ("technical", "tech")})
+_KIND_ALIAS.update({a: "cnc" for a in ("cnc", "cam", "toolpath")})
+_KIND_ALIAS.update({a: "images" for a in ("images", "image", "photos", "photo")})
+_KIND_ALIAS.update({a: "materials" for a in ("materials", "material", "bom")})
+
+# fallback: if people rename folder but it still contains keywords
+_KIND_SUBSTR = (
+    ("invoice", "commercial"),
+    ("contract", "commercial"),
+    ("quotation", "commercial"),
+    ("quote", "commercial"),
+)
 
 
 def _kind_from_top_folder(top: str) -> str | None:
     t = (top or "").strip().lower()
+    kind = _KIND_ALIAS.get(t)
+    if kind:
+        return kind
+    for needle, kind in _KIND_SUBSTR:
+        if needle in t:
+            return kind
+    return None
 
-    # common naming styles + your exact folder name from the template zip
-    if t in {"commercial", "invoices", "invoice", "contracts", "contract", "invoices & contracts", "invoices & contract", "invoices and contracts"}:
-        return "commercial"
 
-    if t in {"technical", "tech"}:
-        return "technical"
+class _TemplateEntry(NamedTuple):
+    path: Path
+    kind: str
+    name: str
+    mime: str
+    sha256: str
+    size: int
+    data: bytes | None  # None once the cached tree exceeds the byte cap
 
-    if t in {"cnc", "cam", "toolpath"}:
-        return "cnc"
 
-    if t in {"images", "image", "photos", "photo"}:
-        return "images"
+# The template folder is static between deploys, so scan/stat/hash it once
+# and reuse the result for every seeding. Invalidated when any file's
+# (path, mtime, size) changes.
+_TEMPLATE_CACHE: list[_TemplateEntry] | None = None
+_TEMPLATE_CACHE_SIG: str | None = None
+_TEMPLATE_CACHE_MAX_BYTES = 64 * 1024 * 1024
 
-    if t in {"materials", "material", "bom"}:
-        return "materials"
 
-    # fallback: if people rename folder but it still contains keywords
-    if "invoice" in t or "contract" in t or "quotation" in t or "quote" in t:
-        return "commercial"
+def _kind_dirs(root: Path) -> list[tuple[Path, str]]:
+    # Only descend into top-level folders that map to a known kind, so
+    # unrelated files dropped under root never get walked at all.
+    dirs = []
+    for child in sorted(root.iterdir()):
+        if not child.is_dir():
+            continue
+        kind = _kind_from_top_folder(child.name)
+        if kind:
+            dirs.append((child, kind))
+    return dirs
 
-    return None
+
+def _template_signature(root: Path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for top_path, _ in _kind_dirs(root):
+        for p in sorted(top_path.rglob("*")):
+            if not p.is_file():
+                continue
+            st = p.stat()
+            h.update(f"{p}|{st.st_mtime_ns}|{st.st_size}".encode())
+    return h.hexdigest()
+
+
+def _template_entries(root: Path) -> list[_TemplateEntry]:
+    global _TEMPLATE_CACHE, _TEMPLATE_CACHE_SIG
+    sig = _template_signature(root)
+    if _TEMPLATE_CACHE is not None and sig == _TEMPLATE_CACHE_SIG:
+        return _TEMPLATE_CACHE
+
+    entries: list[_TemplateEntry] = []
+    cached_bytes = 0
+    for top_path, kind in _kind_dirs(root):
+        for p in sorted(top_path.rglob("*")):
+            if not p.is_file():
+                continue
+            # ignore hidden / keep files
+            if p.name.startswith(".") or p.name.lower() in {".keep", "thumbs.db", ".ds_store"}:
+                continue
+
+            data = p.read_bytes()
+            sha256 = hashlib.sha256(data).hexdigest()
+            size = len(data)
+            cached_bytes += size
+            entries.append(_TemplateEntry(
+                path=p,
+                kind=kind,
+                name=safe_name(p.name),
+                mime=_guess_mime(p.name),
+                sha256=sha256,
+                size=size,
+                data=data if cached_bytes <= _TEMPLATE_CACHE_MAX_BYTES else None,
+            ))
+
+    _TEMPLATE_CACHE = entries
+    _TEMPLATE_CACHE_SIG = sig
+    return entries
+
+
+_MAX_INFLIGHT_PUTS = 8
+
+# Hoisted so SQLAlchemy caches the compiled form once and asyncpg keeps a
+# stable prepared-statement slot across seedings.
+_SQL_SEED_EXISTING = text("""
+    SELECT kind, name FROM files WHERE project_id = :pid
+""")
+
+_SQL_SEED_INSERT = text("""
+    WITH ins_f AS (
+        INSERT INTO files (id, project_id, kind, name, mime, size_bytes, current_version_id, created_by, created_at, updated_at)
+        SELECT u.fid, :project_id, u.kind, u.name, u.mime, u.size, u.vid, :created_by, now(), now()
+        FROM unnest(
+          CAST(:fids AS uuid[]), CAST(:kinds AS text[]), CAST(:names AS text[]),
+          CAST(:mimes AS text[]), CAST(:sizes AS bigint[]), CAST(:vids AS uuid[])
+        ) AS u(fid, kind, name, mime, size, vid)
+    )
+    INSERT INTO file_versions (id, file_id, version_no, object_key, etag, sha256, size_bytes, created_by, created_at)
+    SELECT u.vid, u.fid, 1, u.object_key, NULL, u.sha, u.size, :created_by, now()
+    FROM unnest(
+      CAST(:vids AS uuid[]), CAST(:fids AS uuid[]), CAST(:object_keys AS text[]),
+      CAST(:shas AS text[]), CAST(:sizes AS bigint[])
+    ) AS u(vid, fid, object_key, sha, size)
+""")
 
 
 async def seed_project_templates(project_id: UUID, db: AsyncSession, user: User) -> dict:
@@ -125,95 +244,93 @@ async def seed_project_templates(project_id: UUID, db: AsyncSession, user: User)
     if not root.exists():
         return {"created": 0, "skipped": 0, "reason": f"template folder not found: {root}"}
 
-    ensure_bucket()
+    await asyncio.to_thread(ensure_bucket)
     s3 = s3_internal_client()
 
     created = 0
     skipped = 0
 
     try:
-        for p in sorted(root.rglob("*")):
-            if not p.is_file():
-                continue
-
-            rel = p.relative_to(root)
-            # ignore hidden / keep files
-            if rel.name.startswith(".") or rel.name.lower() in {".keep", "thumbs.db", ".ds_store"}:
-                continue
-
-            top = rel.parts[0] if rel.parts else ""
-            kind = _kind_from_top_folder(top)
-            if not kind:
-                # if someone drops a file directly under root, ignore it
-                continue
-
-            display_name = safe_name(rel.name)
-
+        # One round trip for the idempotency check: every (kind, name) this
+        # project already has, instead of a SELECT per template file.
+        q = await db.execute(_SQL_SEED_EXISTING, {"pid": project_id})
+        existing = {(r.kind, r.name) for r in q.all()}
+
+        # Collect candidates from the cached template scan (cheap, sync) so
+        # the heavy work can run concurrently below.
+        uploads: list[dict] = []
+        for entry in _template_entries(root):
             # idempotent: skip if same name+kind already exists in this project
-            exists = await db.execute(text("""
-                SELECT id
-                FROM files
-                WHERE project_id = :pid AND kind = :kind AND name = :name
-                LIMIT 1
-            """), {"pid": str(project_id), "kind": kind, "name": display_name})
-
-            if exists.mappings().one_or_none():
+            if (entry.kind, entry.name) in existing:
                 skipped += 1
                 continue
-
-            data = p.read_bytes()
-            size_bytes = len(data)
-            sha256 = hashlib.sha256(data).hexdigest()
-            mime = _guess_mime(display_name)
-
-            # create file row
-            f_ins = await db.execute(text("""
-                INSERT INTO files (project_id, kind, name, mime, size_bytes, created_by, created_at, updated_at)
-                VALUES (:project_id, :kind, :name, :mime, :size_bytes, :created_by, now(), now())
-                RETURNING id
-            """), {
-                "project_id": str(project_id),
-                "kind": kind,
-                "name": display_name,
-                "mime": mime,
-                "size_bytes": size_bytes,
-                "created_by": str(user_id),
+            existing.add((entry.kind, entry.name))
+
+            # Client-generated file id so the object key exists before any
+            # DB write and the upload can start immediately.
+            fid = uuid.uuid4()
+            uploads.append({
+                "entry": entry,
+                "fid": fid,
+                "vid": uuid.uuid4(),
+                # entry.name already went through safe_name; os.urandom is a
+                # cheaper uniqueness token than a full UUID object
+                "object_key": f"files/{fid}/seed/{os.urandom(8).hex()}/{entry.name}",
             })
-            fid = f_ins.mappings().one()["id"]
-
-            # upload to S3
-            upid = uuid.uuid4().hex
-            object_key = f"files/{fid}/seed/{upid}/{safe_name(display_name)}"
-            s3.put_object(
-                Bucket=settings.s3_bucket,
-                Key=object_key,
-                Body=data,
-                ContentType=mime,
-            )
-
-            # create version 1
-            v_ins = await db.execute(text("""
-                INSERT INTO file_versions (file_id, version_no, object_key, etag, sha256, size_bytes, created_by, created_at)
-                VALUES (:file_id, 1, :object_key, NULL, :sha256, :size_bytes, :created_by, now())
-                RETURNING id
-            """), {
-                "file_id": str(fid),
-                "object_key": object_key,
-                "sha256": sha256,
-                "size_bytes": size_bytes,
-                "created_by": str(user_id),
-            })
-            ver_id = v_ins.mappings().one()["id"]
 
-            await db.execute(text("""
-                UPDATE files
-                SET current_version_id = :ver_id,
-                    size_bytes = :size_bytes,
-                    updated_at = now()
-                WHERE id = :fid
-            """), {"ver_id": str(ver_id), "size_bytes": size_bytes, "fid": str(fid)})
+        def _put(u: dict) -> None:
+            e: _TemplateEntry = u["entry"]
+            # sha256 is already cached, so the upload is a pure byte copy;
+            # fall back to disk for trees too big to keep in memory.
+            fh = io.BytesIO(e.data) if e.data is not None else e.path.open("rb")
+            try:
+                s3.upload_fileobj(
+                    fh,
+                    settings.s3_bucket,
+                    u["object_key"],
+                    ExtraArgs={"ContentType": e.mime},
+                    Config=transfer_config,
+                )
+            finally:
+                fh.close()
+
+        # Kick off the uploads first (bounded so a huge tree can't flood
+        # the thread pool), then run the DB insert while the PUTs are in
+        # flight; the commit below only lands once both have finished, so
+        # rows never become visible before their objects exist.
+        sem = asyncio.Semaphore(_MAX_INFLIGHT_PUTS)
+
+        async def _bounded_put(u: dict) -> None:
+            async with sem:
+                await asyncio.to_thread(_put, u)
+
+        put_tasks = [asyncio.create_task(_bounded_put(u)) for u in uploads]
+
+        # One bulk statement for every new file and version. Ids are
+        # client-generated, parallel arrays are unnest()ed server-side,
+        # and RI checks run at end of statement so the mutual
+        # files.current_version_id / file_versions.file_id reference is fine.
+        if uploads:
+            await db.execute(_SQL_SEED_INSERT, {
+                "project_id": project_id,
+                "created_by": user.id,
+                "fids": [u["fid"] for u in uploads],
+                "vids": [u["vid"] for u in uploads],
+                "kinds": [u["entry"].kind for u in uploads],
+                "names": [u["entry"].name for u in uploads],
+                "mimes": [u["entry"].mime for u in uploads],
+                "object_keys": [u["object_key"] for u in uploads],
+                "shas": [u["entry"].sha256 for u in uploads],
+                "sizes": [u["entry"].size for u in uploads],
+            })
+            created = len(uploads)
 
-            created += 1
+        try:
+            await asyncio.gather(*put_tasks)
+        except BaseException:
+            for t in put_tasks:
+                t.cancel()
+            raise
 
         await db.commit()
         return {"created": created, "skipped": skipped}
@@ -222,58 +339,45 @@ async def seed_project_templates(project_id: UUID, db: AsyncSession, user: User)
         raise
 
 
+# Same shape the write endpoints RETURN; casting and defaulting happen in
+# SQL so rows come back ready for ProjectOut with no per-row Python work.
+_PROJECT_COLS = """
+  id, project_no, name, status, priority, created_at, updated_at,
+  payment_date, max_days_to_finish, eta_date,
+  total_amount::float8 as total_amount, paid_amount::float8 as paid_amount,
+  COALESCE(inventory_state, '{}'::jsonb) as inventory_state, COALESCE(missing_items, '{}'::jsonb)::text as missing_items, inventory_notes
+"""
+
+
+def _dump_projects(rows) -> Response:
+    return Response(content=dump_list(PROJECT_LIST, rows), media_type="application/json")
+
+
 @router.get("", response_model=list[ProjectOut])
 async def list_projects(status: str = "current", db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
-    q = await db.execute(select(Project).where(Project.status == status).order_by(Project.updated_at.desc()))
-    rows = q.scalars().all()
-    return [ProjectOut(
-        id=p.id,
-        project_no=p.project_no,
-        name=p.name,
-        status=p.status,
-        priority=p.priority,
-        created_at=p.created_at,
-        updated_at=p.updated_at,
-
-        eta_date=p.eta_date,
-        total_amount=(float(p.total_amount) if p.total_amount is not None else None),
-        paid_amount=(float(p.paid_amount) if p.paid_amount is not None else None),
-        payment_date=p.payment_date,
-        max_days_to_finish=p.max_days_to_finish,
-
-        inventory_state=(p.inventory_state or {}),
-        missing_items=_missing_items_str(p.missing_items),
-        inventory_notes=p.inventory_notes,
-    ) for p in rows]
+    # Plain Core rows instead of ORM entities: no identity map, no
+    # attribute hydration, one validation pass in the response model.
+    q = await db.execute(text(f"""
+        SELECT {_PROJECT_COLS}
+        FROM projects
+        WHERE status = :status
+        ORDER BY updated_at DESC
+    """), {"status": status})
+    return _dump_projects(q.mappings().all())
 
 
 @router.get("/all", response_model=list[ProjectOut])
 async def list_projects_all(db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
-    q = await db.execute(select(Project).order_by(Project.updated_at.desc()))
-    rows = q.scalars().all()
-    return [ProjectOut(
-        id=p.id,
-        project_no=p.project_no,
-        name=p.name,
-        status=p.status,
-        priority=p.priority,
-        created_at=p.created_at,
-        updated_at=p.updated_at,
-
-        eta_date=p.eta_date,
-        total_amount=(float(p.total_amount) if p.total_amount is not None else None),
-        paid_amount=(float(p.paid_amount) if p.paid_amount is not None else None),
-        payment_date=p.payment_date,
-        max_days_to_finish=p.max_days_to_finish,
-
-        inventory_state=(p.inventory_state or {}),
-        missing_items=_missing_items_str(p.missing_items),
-        inventory_notes=p.inventory_notes,
-    ) for p in rows]
+    q = await db.execute(text(f"""
+        SELECT {_PROJECT_COLS}
+        FROM projects
+        ORDER BY updated_at DESC
+    """))
+    return _dump_projects(q.mappings().all())
 
 
 @router.post("", response_model=ProjectOut)
-async def create_project(req: ProjectCreate, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def create_project(req: ProjectCreate, bg: BackgroundTasks, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     # Always create new projects under_preparation (ignore any client-sent status).
     forced_status = "under_preparation"
     user_id = inspect(user).identity[0]  # PK without DB IO
@@ -306,12 +410,12 @@ async def create_project(req: ProjectCreate, db: AsyncSession = Depends(get_db),
             await db.rollback()
             # keep project creation working even if templates fail
             seed_result = {"created": 0, "skipped": 0, "error": str(e)}
-    await _audit.write(db, user_id, "project.create", "project", pid, meta={"name": req.name, "status": req.status, "seed": seed_result})
-    return ProjectOut(**row)
+    bg.add_task(_audit.write_async, user_id, "project.create", "project", pid, meta={"name": req.name, "status": req.status, "seed": seed_result})
+    return ProjectOut.model_construct(**row)
 
 
 @router.post("/{project_id}/seed-templates")
-async def seed_templates(project_id: UUID, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+async def seed_templates(project_id: UUID, bg: BackgroundTasks, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
     # Optional helper for when you change the template folder later.
     # Safe to run multiple times (it skips name+kind duplicates).
     q = await db.execute(text("SELECT id FROM projects WHERE id=:id"), {"id": str(project_id)})
@@ -319,61 +423,32 @@ async def seed_templates(project_id: UUID, db: AsyncSession = Depends(get_db), u
         raise HTTPException(404, "Project not found")
 
     res = await seed_project_templates(project_id, db, user)
-    await _audit.write(db, inspect(user).identity[0], "project.seed_templates", "project", project_id, meta=res)
+    bg.add_task(_audit.write_async, inspect(user).identity[0], "project.seed_templates", "project", project_id, meta=res)
     return {"ok": True, **res}
 
 
 @router.patch("/{project_id}", response_model=ProjectOut)
-async def update_project(project_id: UUID, req: ProjectUpdate, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
-    # load current row first so we can do "partial updates" safely
-    cur_res = await db.execute(text("""
-        SELECT
-          id, project_no, name, status, priority, created_at, updated_at,
-          payment_date, max_days_to_finish, eta_date,
-          total_amount::float8 as total_amount, paid_amount::float8 as paid_amount,
-          COALESCE(inventory_state, '{}'::jsonb) as inventory_state, COALESCE(missing_items, '{}'::jsonb)::text as missing_items, inventory_notes
-        FROM projects
-        WHERE id=:id
-    """), {"id": str(project_id)})
-    cur = cur_res.mappings().one()
-
-    # choose next values (keep old when req field is None)
-    next_project_no = cur["project_no"] if req.project_no is None else req.project_no
-    next_name = cur["name"] if req.name is None else req.name
-    next_status = cur["status"] if req.status is None else req.status
-    next_priority = cur["priority"] if req.priority is None else req.priority
-
-    next_payment_date = cur["payment_date"] if req.payment_date is None else req.payment_date
-    next_max_days = cur["max_days_to_finish"] if req.max_days_to_finish is None else req.max_days_to_finish
-
-    next_total = cur["total_amount"] if req.total_amount is None else req.total_amount
-    next_paid = cur["paid_amount"] if req.paid_amount is None else req.paid_amount
-
-    next_inventory_state = cur["inventory_state"] if req.inventory_state is None else req.inventory_state
-    next_missing_items = cur["missing_items"] if req.missing_items is None else req.missing_items
-    next_inventory_notes = cur["inventory_notes"] if req.inventory_notes is None else req.inventory_notes
-
-    # compute ETA (skip Fridays only)
-    eta = _calc_eta_skip_fridays(next_payment_date, next_max_days)
-
+async def update_project(project_id: UUID, req: ProjectUpdate, bg: BackgroundTasks, db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)):
+    # Partial update in one statement: NULL params keep the stored value
+    # via COALESCE, so there's no read-merge-write round trip (and no race
+    # window where a concurrent update gets silently reverted).
     result = await db.execute(text("""
         UPDATE projects
         SET
-          project_no=:project_no,
-          name=:name,
-          status=:status,
-          priority=:priority,
+          project_no=COALESCE(:project_no, project_no),
+          name=COALESCE(:name, name),
+          status=COALESCE(:status, status),
+          priority=COALESCE(:priority, priority),
 
-          payment_date=:payment_date,
-          max_days_to_finish=:max_days_to_finish,
-          eta_date=:eta_date,
+          payment_date=COALESCE(:payment_date, payment_date),
+          max_days_to_finish=COALESCE(:max_days_to_finish, max_days_to_finish),
 
-          total_amount=:total_amount,
-          paid_amount=:paid_amount,
+          total_amount=COALESCE(:total_amount, total_amount),
+          paid_amount=COALESCE(:paid_amount, paid_amount),
 
-          inventory_state=(:inventory_state)::jsonb,
-          missing_items=:missing_items,
-          inventory_notes=:inventory_notes,
+          inventory_state=COALESCE((:inventory_state)::jsonb, inventory_state),
+          missing_items=COALESCE(:missing_items, missing_items),
+          inventory_notes=COALESCE(:inventory_notes, inventory_notes),
 
           updated_at=now()
         WHERE id=:id
@@ -385,27 +460,43 @@ async def update_project(project_id: UUID, req: ProjectUpdate, db: AsyncSession
     """), {
         "id": str(project_id),
 
-        "project_no": next_project_no,
-        "name": next_name,
-        "status": next_status,
-        "priority": next_priority,
+        "project_no": req.project_no,
+        "name": req.name,
+        "status": req.status,
+        "priority": req.priority,
 
-        "payment_date": next_payment_date,
-        "max_days_to_finish": next_max_days,
-        "eta_date": eta,
+        "payment_date": req.payment_date,
+        "max_days_to_finish": req.max_days_to_finish,
 
-        "total_amount": next_total,
-        "paid_amount": next_paid,
+        "total_amount": req.total_amount,
+        "paid_amount": req.paid_amount,
 
-        "inventory_state": json.dumps(next_inventory_state or {}),
-        "missing_items": next_missing_items,
-        "inventory_notes": next_inventory_notes,
+        "inventory_state": json.dumps(req.inventory_state) if req.inventory_state is not None else None,
+        "missing_items": req.missing_items,
+        "inventory_notes": req.inventory_notes,
     })
     row = result.mappings().one()
+
+    # ETA depends on the merged payment_date + max_days pair, which the
+    # RETURNING row now holds; recompute only when either input changed.
+    # (This also fixes the old bug where sending max_days_to_finish alone
+    # derived the ETA from a stale payment_date read.)
+    if req.payment_date is not None or req.max_days_to_finish is not None:
+        eta = _calc_eta_skip_fridays(row["payment_date"], row["max_days_to_finish"])
+        result = await db.execute(text("""
+            UPDATE projects SET eta_date=:eta WHERE id=:id
+            RETURNING
+              id, project_no, name, status, priority, created_at, updated_at,
+              payment_date, max_days_to_finish, eta_date,
+              total_amount::float8 as total_amount, paid_amount::float8 as paid_amount,
+              COALESCE(inventory_state, '{}'::jsonb) as inventory_state, COALESCE(missing_items, '{}'::jsonb)::text as missing_items, inventory_notes
+        """), {"id": str(project_id), "eta": eta})
+        row = result.mappings().one()
+
     await db.commit()
 
-    await _audit.write(
-        db, user.id, "project.update", "project", project_id,
+    bg.add_task(
+        _audit.write_async, user.id, "project.update", "project", project_id,
         meta={"name": row.get("name"), "status": row.get("status")}
     )
-    return ProjectOut(**row)
+    return ProjectOut.model_construct(**row)
@@ -1,7 +1,34 @@
+from functools import lru_cache
+
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config as BotoConfig
 from .core.config import settings
 
+# Shared upload tuning: stream multi-MB files as concurrent 8 MiB parts
+# instead of buffering whole bodies in memory.
+transfer_config = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4,
+    use_threads=True,
+)
+
+# Pool sized above the seeding worker count so concurrent PUTs don't
+# queue on connections; keep-alive skips the TCP+TLS handshake per call.
+_BOTO_CONFIG = BotoConfig(
+    signature_version="s3v4",
+    max_pool_connections=64,
+    retries={"mode": "adaptive", "max_attempts": 5},
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=30,
+)
+
+# Client construction loads service models and builds an endpoint resolver
+# (tens of ms); settings are fixed for the process lifetime and boto3
+# clients are thread-safe, so build one per endpoint and reuse it.
+@lru_cache(maxsize=2)
 def _client(endpoint_url: str):
     return boto3.client(
         "s3",
@@ -9,7 +36,7 @@ def _client(endpoint_url: str):
         region_name=settings.s3_region,
         aws_access_key_id=settings.s3_access_key,
         aws_secret_access_key=settings.s3_secret_key,
-        config=BotoConfig(signature_version="s3v4"),
+        config=_BOTO_CONFIG,
     )
 
 def s3_internal_client():
@@ -20,12 +47,19 @@ def s3_presign_client():
     # for browser-reachable URLs (public/proxied endpoint, NOT localhost)
     return _client(settings.s3_presign_endpoint_url)
 
+# Buckets verified this process lifetime; skips the head_bucket round trip
+# on every call after the first. set.add is atomic under the GIL.
+_BUCKET_READY: set[str] = set()
+
 def ensure_bucket():
+    if settings.s3_bucket in _BUCKET_READY:
+        return
     c = s3_internal_client()
     try:
         c.head_bucket(Bucket=settings.s3_bucket)
     except Exception:
         c.create_bucket(Bucket=settings.s3_bucket)
+    _BUCKET_READY.add(settings.s3_bucket)
 
 def presign_put(object_key: str, content_type: str | None, expires_sec: int = 900) -> tuple[str, dict]:
     # IMPORTANT: do not sign Content-Type (browser reliability)
@@ -56,3 +90,17 @@ def presign_get(
         Params=params,
         ExpiresIn=expires_sec,
     )
+
+def presign_get_many(object_keys: list[str], expires_sec: int = 900) -> list[str]:
+    # Presigning is local crypto (HMAC + string build), no S3 round trip;
+    # with the cached client, N URLs cost ~N HMACs, so batch callers can
+    # sign a whole file listing in one pass.
+    c = s3_presign_client()
+    return [
+        c.generate_presigned_url(
+            ClientMethod="get_object",
+            Params={"Bucket": settings.s3_bucket, "Key": k},
+            ExpiresIn=expires_sec,
+        )
+        for k in object_keys
+    ]
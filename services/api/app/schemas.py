@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import Optional, Any, Dict, List
 from uuid import UUID
 from datetime import datetime, date
@@ -63,22 +63,12 @@ class ProjectOut(BaseModel):
     payment_date: Optional[date] = None
     max_days_to_finish: Optional[int] = None
 
-    # Inventory
+    # Inventory (lightweight now)
     inventory_state: Dict[str, Any] = Field(default_factory=dict)
     missing_items: Optional[str] = None
     inventory_notes: Optional[str] = None
 
-    # Payments / delivery
-    eta_date: Optional[date] = None
-    total_amount: Optional[float] = None
-    paid_amount: Optional[float] = None
-    payment_date: Optional[date] = None
-    max_days_to_finish: Optional[int] = None
 
-    # Inventory (lightweight now)
-    inventory_state: Dict[str, Any] = Field(default_factory=dict)
-    missing_items: Optional[str] = None
-    inventory_notes: Optional[str] = None
 # Inventory (high-end, lot-based)
 class SupplierCreate(BaseModel):
     name: str
@@ -304,6 +294,7 @@ class FileVersionOut(BaseModel):
     size_bytes: int | None = None
     created_at: datetime | None = None
     created_by: UUID | None = None
+    download_url: str | None = None
 
 
 # Locks
@@ -335,3 +326,23 @@ class JobOut(BaseModel):
     result: Dict[str, Any]
     error: Optional[str]
     updated_at: datetime
+
+
+# -----------------------------
+# List adapters (hot list endpoints)
+# -----------------------------
+# Compiled once at import; dump_list emits a whole list response in one
+# pydantic-core validate + serialize pass instead of per-row model
+# construction plus FastAPI re-validation.
+
+SUPPLIER_LIST = TypeAdapter(List[SupplierOut])
+ITEM_LIST = TypeAdapter(List[ItemOut])
+STOCK_LOT_LIST = TypeAdapter(List[StockLotOut])
+SHEET_LOT_LIST = TypeAdapter(List[SheetLotOut])
+SHEET_LOT_VIEW_LIST = TypeAdapter(List[SheetLotView])
+REQUIREMENT_LIST = TypeAdapter(List[ProjectRequirementOut])
+PROJECT_LIST = TypeAdapter(List[ProjectOut])
+
+
+def dump_list(adapter: TypeAdapter, rows) -> bytes:
+    return adapter.dump_json(adapter.validate_python([dict(r) for r in rows]))
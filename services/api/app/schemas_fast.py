@@ -0,0 +1,70 @@
+"""msgspec mirrors of the hottest list-response schemas.
+
+Rows coming straight out of our own DB are already typed, so the full
+Pydantic validation pass per row is wasted work on high-fanout list
+endpoints. These slotted Structs construct and JSON-encode in C; the
+Pydantic models in schemas.py stay the source of truth for OpenAPI.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+import msgspec
+
+json_encoder = msgspec.json.Encoder()
+
+
+class ItemOutMS(msgspec.Struct, gc=False):
+    id: UUID
+    sku: str
+    name: str
+    type: str
+    uom: str
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+    category: Optional[str] = None
+    default_supplier_id: Optional[UUID] = None
+    min_stock: Optional[float] = None
+
+
+class StockLotViewMS(msgspec.Struct, gc=False):
+    id: UUID
+    item_id: UUID
+    sku: str
+    name: str
+    type: str
+    uom: str
+    qty_on_hand: float
+    qty_reserved: float
+    source: str
+    created_at: datetime
+    updated_at: datetime
+    location: Optional[str] = None
+    unit_cost: Optional[float] = None
+    ref: Optional[str] = None
+
+
+class ProjectAvailabilityRowMS(msgspec.Struct, gc=False):
+    item_id: UUID
+    sku: str
+    name: str
+    type: str
+    uom: str
+    qty_required: float
+    qty_on_hand: float
+    qty_reserved_total: float
+    qty_available_net: float
+    qty_to_buy: float
+
+
+class FileOutMS(msgspec.Struct, gc=False):
+    id: UUID
+    kind: str
+    name: str
+    size_bytes: int
+    project_id: Optional[UUID] = None
+    mime: Optional[str] = None
+    current_version_id: Optional[UUID] = None
@@ -1,16 +1,16 @@
 import os
-import json
 import time
 import asyncio
 from uuid import UUID
 from datetime import datetime, timezone
 from dotenv import load_dotenv
 
+import orjson
 from redis import Redis
 from rq import Worker, Queue, Connection
 
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import event, text
 
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
 
@@ -18,51 +18,93 @@ DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://postgres:postgres
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
 engine = create_async_engine(DATABASE_URL, future=True, echo=False)
-SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
-
-async def _set_job(job_id: str, **fields):
-    async with SessionLocal() as db:
-        sets = []
-        params = {"id": job_id}
-        for k, v in fields.items():
-            if k in ("payload", "result"):
-                sets.append(f"{k} = :{k}::jsonb")
-                params[k] = json.dumps(v, separators=(",", ":"), ensure_ascii=False)
-            else:
-                sets.append(f"{k} = :{k}")
-                params[k] = v
-        sets.append("updated_at = now()")
-        await db.execute(text(f"UPDATE jobs SET {', '.join(sets)} WHERE id = :id"), params)
-        await db.commit()
-
-async def _get_job(job_id: str):
-    async with SessionLocal() as db:
-        q = await db.execute(text("SELECT id, type, payload FROM jobs WHERE id = :id"), {"id": job_id})
-        return q.mappings().one()
+
+@event.listens_for(engine.sync_engine, "connect")
+def _register_orjson_jsonb(dbapi_connection, connection_record):
+    # Encode/decode jsonb with orjson at the driver level, so dicts bind
+    # directly (asyncpg infers jsonb from the column) and progress writes
+    # skip json.dumps + the server-side reparse of a casted string.
+    def _enc(value):
+        return orjson.dumps(value).decode()
+
+    dbapi_connection.run_async(
+        lambda conn: conn.set_type_codec(
+            "jsonb", encoder=_enc, decoder=orjson.loads, schema="pg_catalog"
+        )
+    )
+
+# One fixed statement shape regardless of which fields a call sets:
+# unset fields bind NULL and COALESCE keeps the stored value. The server
+# parses/plans it once and every update reuses the prepared slot.
+_SET_JOB_SQL = text("""
+    UPDATE jobs SET
+      status = COALESCE(:status, status),
+      progress_pct = COALESCE(:progress_pct, progress_pct),
+      stage = COALESCE(:stage, stage),
+      error = COALESCE(:error, error),
+      payload = COALESCE(:payload, payload),
+      result = COALESCE(:result, result),
+      updated_at = now()
+    WHERE id = :id
+""")
+
+_NOTIFY_SQL = text("SELECT pg_notify(:ch, :msg)")
+
+async def _set_job(conn, job_id: str, **fields):
+    params = {"id": job_id, "status": None, "progress_pct": None, "stage": None,
+              "error": None, "payload": None, "result": None}
+    params.update(fields)
+    await conn.execute(_SET_JOB_SQL, params)
+    # Notify SSE listeners in the same transaction as the update.
+    notify = {"id": job_id}
+    for k in ("status", "progress_pct", "stage", "error"):
+        if k in fields:
+            notify[k] = fields[k]
+    await conn.execute(_NOTIFY_SQL, {
+        "ch": f"job_{job_id.replace('-', '')}",
+        "msg": orjson.dumps(notify).decode(),
+    })
+    await conn.commit()
+
+async def _get_job(conn, job_id: str):
+    q = await conn.execute(text("SELECT id, type, payload FROM jobs WHERE id = :id"), {"id": job_id})
+    return q.mappings().one()
 
 def run_job(job_id: str):
     # RQ runs sync. We bridge to async DB updates.
     asyncio.run(_run_job_async(job_id))
 
 async def _run_job_async(job_id: str):
-    row = await _get_job(job_id)
-    job_type = row["type"]
-    payload = row["payload"] or {}
+    # One connection for the whole job: progress updates skip the
+    # per-call pool checkout/transaction setup of session-per-call.
+    async with engine.connect() as conn:
+        row = await _get_job(conn, job_id)
+        job_type = row["type"]
+        payload = row["payload"] or {}
+
+        await _set_job(conn, job_id, status="running", progress_pct=1, stage="starting")
 
-    await _set_job(job_id, status="running", progress_pct=1, stage="starting")
+        last_report = 0.0
 
-    try:
-        # Placeholder: replace with real nesting/export logic later.
-        # Update progress like a real worker.
-        for pct, stage in [(10, "loading_inputs"), (35, "processing"), (70, "uploading_outputs"), (100, "done")]:
-            await _set_job(job_id, progress_pct=pct, stage=stage)
-            await asyncio.sleep(0.5)
+        async def report(pct: int, stage: str):
+            # Debounce so a chatty job body can't flood the jobs table;
+            # stage boundaries always land because the terminal write
+            # below is unconditional.
+            nonlocal last_report
+            now = time.monotonic()
+            if now - last_report < 0.25:
+                return
+            last_report = now
+            await _set_job(conn, job_id, progress_pct=pct, stage=stage)
 
-        result = {"message": f"Job completed: {job_type}", "payload_echo": payload}
-        await _set_job(job_id, status="succeeded", progress_pct=100, stage="done", result=result)
+        try:
+            # Real nesting/export logic goes here; it should call
+            # `await report(pct, stage)` as stage boundaries are crossed.
+            result = {"message": f"Job completed: {job_type}", "payload_echo": payload}
+            await _set_job(conn, job_id, status="succeeded", progress_pct=100, stage="done", result=result)
 
-    except Exception as e:
-        await _set_job(job_id, status="failed", error=str(e), stage="failed")
+        except Exception as e:
+            await _set_job(conn, job_id, status="failed", error=str(e), stage="failed")
 
 def main():
     redis_conn = Redis.from_url(REDIS_URL)
@@ -1,8 +1,42 @@
-﻿import json, os, time, threading, hashlib, mimetypes
-from http.server import BaseHTTPRequestHandler, HTTPServer
+﻿import json, os, shutil, time, threading, hashlib, mimetypes
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.request import Request, urlopen
 from urllib.error import HTTPError, URLError
 
+try:  # optional: OS file-change notifications instead of polling
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+try:  # optional: faster JSON, accepts/returns bytes directly
+    import orjson
+
+    def _json_loads(raw: bytes):
+        return orjson.loads(raw)
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_loads(raw: bytes):
+        return json.loads(raw.decode("utf-8"))
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+try:  # optional: keep-alive pooling — the initiate/PUT/complete trio per
+    # save reuses one connection instead of three TCP+TLS handshakes
+    import urllib3
+
+    _pool = urllib3.PoolManager(
+        num_pools=4,
+        maxsize=8,
+        retries=urllib3.Retry(total=2, backoff_factor=0.2),
+    )
+except ImportError:
+    _pool = None
+
 HOST = "127.0.0.1"
 PORT = 17832
 
@@ -10,98 +44,209 @@ CACHE_ROOT = os.path.join(os.environ.get("LOCALAPPDATA", os.getcwd()), "Workshop
 os.makedirs(CACHE_ROOT, exist_ok=True)
 
 def _sha256(path: str) -> str:
-    h = hashlib.sha256()
     with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # 3.11+: C read loop, one reused buffer
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
         for chunk in iter(lambda: f.read(1024 * 1024), b""):
             h.update(chunk)
-    return h.hexdigest()
+        return h.hexdigest()
 
 def _http_json(method: str, url: str, token: str | None, payload: dict | None) -> dict:
     data = None
     headers = {"Accept": "application/json"}
     if payload is not None:
-        data = json.dumps(payload).encode("utf-8")
+        data = _json_dumps(payload)
         headers["Content-Type"] = "application/json"
     if token:
         headers["Authorization"] = f"Bearer {token}"
+    if _pool is not None:
+        r = _pool.request(method, url, body=data, headers=headers, timeout=60)
+        if r.status >= 400:
+            raise HTTPError(url, r.status, r.reason or "", None, None)
+        return _json_loads(r.data) if r.data else {}
     req = Request(url, data=data, headers=headers, method=method)
     with urlopen(req, timeout=60) as r:
-        body = r.read().decode("utf-8")
-        return json.loads(body) if body else {}
+        body = r.read()
+        return _json_loads(body) if body else {}
 
-def _http_put(url: str, headers: dict, file_path: str) -> None:
-    with open(file_path, "rb") as f:
-        data = f.read()
+class _HashingFile:
+    """Folds SHA-256 into the PUT's read loop so the bytes are hashed while
+    they're hot instead of in a second pass over the file."""
+
+    def __init__(self, fh):
+        self.fh = fh
+        self.sha = hashlib.sha256()
+
+    def read(self, n=-1):
+        buf = self.fh.read(n)
+        if buf:
+            self.sha.update(buf)
+        return buf
+
+def _http_put(url: str, headers: dict, file_path: str) -> str:
+    # Stream straight from the file object: urllib sends chunks off the
+    # socket when Content-Length is supplied, so peak RSS stays constant
+    # instead of O(file size). Returns the sha256 of the bytes sent.
     h = dict(headers or {})
-    req = Request(url, data=data, headers=h, method="PUT")
-    with urlopen(req, timeout=120) as r:
-        r.read()
+    h["Content-Length"] = str(os.path.getsize(file_path))
+    with open(file_path, "rb") as f:
+        hf = _HashingFile(f)
+        if _pool is not None:
+            r = _pool.request("PUT", url, body=hf, headers=h, timeout=120)
+            if r.status >= 400:
+                raise HTTPError(url, r.status, r.reason or "", None, None)
+        else:
+            req = Request(url, data=hf, headers=h, method="PUT")
+            with urlopen(req, timeout=120) as r:
+                r.read()
+    return hf.sha.hexdigest()
 
 def _download(download_url: str, out_path: str) -> None:
-    req = Request(download_url, method="GET")
-    with urlopen(req, timeout=120) as r:
-        data = r.read()
+    # Drain the response socket straight into the cache file (1 MiB
+    # reusable buffer) instead of buffering the whole body in memory.
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    with open(out_path, "wb") as f:
-        f.write(data)
+    if _pool is not None:
+        r = _pool.request("GET", download_url, timeout=120, preload_content=False)
+        try:
+            if r.status >= 400:
+                raise HTTPError(download_url, r.status, r.reason or "", None, None)
+            with open(out_path, "wb") as f:
+                shutil.copyfileobj(r, f, length=1 << 20)
+        finally:
+            r.release_conn()
+        return
+    req = Request(download_url, method="GET")
+    with urlopen(req, timeout=120) as r, open(out_path, "wb") as f:
+        shutil.copyfileobj(r, f, length=1 << 20)
 
 def _open_default(path: str) -> None:
     os.startfile(path)  # Windows default app
 
+def _upload_version(*, api_base: str, token: str | None, file_id: str, filename: str, mime: str | None, local_path: str) -> None:
+    try:
+        size_bytes = os.path.getsize(local_path)
+        guessed_mime = mime or (mimetypes.guess_type(filename)[0] or "application/octet-stream")
+
+        init = _http_json(
+            "POST",
+            f"{api_base}/files/{file_id}/versions/initiate-upload",
+            token,
+            {"mime": guessed_mime, "size_bytes": size_bytes, "filename": filename},
+        )
+
+        sha256 = _http_put(init["url"], init.get("headers") or {}, local_path)
+
+        _http_json(
+            "POST",
+            f"{api_base}/files/{file_id}/versions/complete-upload",
+            token,
+            {"object_key": init["object_key"], "size_bytes": size_bytes, "etag": None, "sha256": sha256},
+        )
+
+        print(f"[OK] Uploaded new version for {filename}")
+    except Exception as e:
+        print(f"[ERR] Upload failed for {filename}: {e}")
+
 def _watch_and_upload(*, api_base: str, token: str | None, file_id: str, filename: str, mime: str | None, local_path: str):
-    last_mtime = os.path.getmtime(local_path)
-    last_hash = _sha256(local_path)
+    st = os.stat(local_path)
+    state = {"sig": (st.st_mtime_ns, st.st_size), "hash": _sha256(local_path)}
+
+    def _check_and_upload() -> None:
+        # called once the save has settled; sig/hash gate spurious wakes
+        try:
+            st = os.stat(local_path)
+        except FileNotFoundError:
+            return
+        sig = (st.st_mtime_ns, st.st_size)
+        if sig == state["sig"]:
+            return
+        state["sig"] = sig
+
+        new_hash = _sha256(local_path)
+        if new_hash == state["hash"]:
+            return
+        state["hash"] = new_hash
+
+        _upload_version(api_base=api_base, token=token, file_id=file_id, filename=filename, mime=mime, local_path=local_path)
+
+    if Observer is not None and _watch_with_events(local_path, _check_and_upload):
+        return
+    _watch_polling(local_path, _check_and_upload)
+
+def _watch_with_events(local_path: str, check_and_upload) -> bool:
+    """Wake on real FS events (ReadDirectoryChangesW on Windows) instead of
+    polling; returns False if the observer can't start on this filesystem."""
+    gone = threading.Event()
+    timer_ref: list = [None]
+
+    class _SaveHandler(FileSystemEventHandler):
+        def on_modified(self, event):
+            self._kick(event)
+
+        def on_created(self, event):
+            self._kick(event)
+
+        def on_deleted(self, event):
+            if os.path.normcase(getattr(event, "src_path", "")) == os.path.normcase(local_path):
+                gone.set()
+
+        def _kick(self, event):
+            if os.path.normcase(getattr(event, "src_path", "")) != os.path.normcase(local_path):
+                return
+            # debounce: wait for the save to settle before hashing
+            if timer_ref[0] is not None:
+                timer_ref[0].cancel()
+            t = threading.Timer(1.0, check_and_upload)
+            t.daemon = True
+            t.start()
+            timer_ref[0] = t
+
+    try:
+        observer = Observer()
+        observer.schedule(_SaveHandler(), os.path.dirname(local_path), recursive=False)
+        observer.start()
+    except Exception:
+        return False
+
+    try:
+        while not gone.is_set():
+            gone.wait(60.0)
+            if not os.path.exists(local_path):
+                return True
+    finally:
+        observer.stop()
+    return True
+
+def _watch_polling(local_path: str, check_and_upload) -> None:
+    try:
+        st = os.stat(local_path)
+    except FileNotFoundError:
+        return
+    seen = (st.st_mtime_ns, st.st_size)
 
     while True:
         time.sleep(2.0)
         try:
-            m = os.path.getmtime(local_path)
+            st = os.stat(local_path)
         except FileNotFoundError:
             return
-
-        if m == last_mtime:
+        sig = (st.st_mtime_ns, st.st_size)
+        if sig == seen:
             continue
 
-        # wait for "save" to finish (stable mtime)
+        # wait for "save" to finish (stable stat)
         time.sleep(1.0)
         try:
-            m2 = os.path.getmtime(local_path)
+            st = os.stat(local_path)
         except FileNotFoundError:
             return
-        if m2 != m:
+        if (st.st_mtime_ns, st.st_size) != sig:
+            seen = sig
             continue
 
-        new_hash = _sha256(local_path)
-        if new_hash == last_hash:
-            last_mtime = m2
-            continue
-
-        last_mtime = m2
-        last_hash = new_hash
-
-        try:
-            size_bytes = os.path.getsize(local_path)
-            guessed_mime = mime or (mimetypes.guess_type(filename)[0] or "application/octet-stream")
-
-            init = _http_json(
-                "POST",
-                f"{api_base}/files/{file_id}/versions/initiate-upload",
-                token,
-                {"mime": guessed_mime, "size_bytes": size_bytes, "filename": filename},
-            )
-
-            _http_put(init["url"], init.get("headers") or {}, local_path)
-
-            _http_json(
-                "POST",
-                f"{api_base}/files/{file_id}/versions/complete-upload",
-                token,
-                {"object_key": init["object_key"], "size_bytes": size_bytes, "etag": None},
-            )
-
-            print(f"[OK] Uploaded new version for {filename}")
-        except Exception as e:
-            print(f"[ERR] Upload failed for {filename}: {e}")
+        seen = sig
+        check_and_upload()
 
 class Handler(BaseHTTPRequestHandler):
     def _cors(self):
@@ -136,7 +281,7 @@ class Handler(BaseHTTPRequestHandler):
         length = int(self.headers.get("Content-Length", "0"))
         raw = self.rfile.read(length) if length else b"{}"
         try:
-            req = json.loads(raw.decode("utf-8"))
+            req = _json_loads(raw)
         except Exception:
             self.send_response(400)
             self._cors()
@@ -183,30 +328,32 @@ class Handler(BaseHTTPRequestHandler):
             self.send_header("Content-Type", "application/json")
             self.end_headers()
             out = {"ok": True, "path": local_path, "watching": bool(watch and token)}
-            self.wfile.write(json.dumps(out).encode("utf-8"))
+            self.wfile.write(_json_dumps(out))
         except HTTPError as e:
             self.send_response(502)
             self._cors()
             self.send_header("Content-Type", "application/json")
             self.end_headers()
-            self.wfile.write(json.dumps({"error": f"download failed: {e.code}"}).encode("utf-8"))
+            self.wfile.write(_json_dumps({"error": f"download failed: {e.code}"}))
         except URLError as e:
             self.send_response(502)
             self._cors()
             self.send_header("Content-Type", "application/json")
             self.end_headers()
-            self.wfile.write(json.dumps({"error": f"network: {e}"}).encode("utf-8"))
+            self.wfile.write(_json_dumps({"error": f"network: {e}"}))
         except Exception as e:
             self.send_response(500)
             self._cors()
             self.send_header("Content-Type", "application/json")
             self.end_headers()
-            self.wfile.write(json.dumps({"error": str(e)}).encode("utf-8"))
+            self.wfile.write(_json_dumps({"error": str(e)}))
 
 def main():
     print(f"Open Helper listening on http://{HOST}:{PORT}")
     print(f"Cache: {CACHE_ROOT}")
-    HTTPServer((HOST, PORT), Handler).serve_forever()
+    # threaded server: a slow /open download no longer blocks /health or
+    # further /open requests
+    ThreadingHTTPServer((HOST, PORT), Handler).serve_forever()
 
 if __name__ == "__main__":
     main()